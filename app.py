@@ -19,155 +19,2171 @@ bildirilen zengin metin/link ve zorunlu onay kutusu hatalarını düzeltir.
 
 import os
 import io
+import re
+import csv
+import gzip
+import hmac
 import json
-import requests
-import pandas as pd
-from bs4 import BeautifulSoup
-from flask import Flask, request, render_template_string, send_file, session
-from urllib.parse import unquote
+import hashlib
+import logging
+import time
+import sqlite3
+import secrets
+import tempfile
+import queue
+import random
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from enum import Enum
+from functools import lru_cache
+from typing import NamedTuple, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import importlib.util
+import click
+from flask import (Blueprint, Flask, Response, current_app, g, has_request_context, request, render_template,
+                   make_response, redirect, send_file, session, url_for)
+from jinja2 import ChoiceLoader, DictLoader
+from html.parser import HTMLParser
+from urllib.parse import unquote, urlencode, urljoin, urlsplit
 from datetime import datetime
 
-app = Flask(__name__)
-app.secret_key = os.environ.get("SECRET_KEY", "a-very-secure-dev-fallback-key-indeed")
+# requests, bs4 ve openpyxl yalnızca ihtiyaç duyan kod yollarında, ilk kullanımda yüklenir;
+# böylece worker'lar giriş sayfasını sunmaya hazır hale gelmek için bunları beklemez.
+bp = Blueprint('formklon', __name__)
+logger = logging.getLogger(__name__)
+
+# WARM_IMPORTS=1: ağır bağımlılıklar create_app() içinde önceden yüklenir. 'gunicorn --preload'
+# ile birlikte kullanıldığında bu modüller ana süreçte bir kez yüklenip worker'larla paylaşılır.
+WARM_IMPORTS = os.environ.get("WARM_IMPORTS", "0") == "1"
+
+# --- Önbellek Ayarları ---
+# FORM_CACHE_BACKEND: 'memory' (varsayılan, işlem içi) veya 'sqlite' (tüm gunicorn worker'ları paylaşır)
+FORM_CACHE_BACKEND = os.environ.get("FORM_CACHE_BACKEND", "memory").lower()
+FORM_CACHE_PATH = os.environ.get("FORM_CACHE_PATH", os.path.join(tempfile.gettempdir(), "formklon_cache.sqlite3"))
+FORM_CACHE_TTL = int(os.environ.get("FORM_CACHE_TTL", 600))
+FORM_CACHE_MAX_ENTRIES = int(os.environ.get("FORM_CACHE_MAX_ENTRIES", 256))
+FORM_CACHE_MAX_BYTES = int(os.environ.get("FORM_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+# Doldurulmakta olan formların yapısı session çerezinde değil, sunucu tarafında tutulur.
+# 'sqlite' (varsayılan) worker'lar arasında paylaşılır; 'memory' tek worker içindir.
+STRUCTURE_STORE_BACKEND = os.environ.get("STRUCTURE_STORE_BACKEND", "sqlite").lower()
+STRUCTURE_STORE_PATH = os.environ.get("STRUCTURE_STORE_PATH", FORM_CACHE_PATH)
+STRUCTURE_STORE_TTL = int(os.environ.get("STRUCTURE_STORE_TTL", 6 * 3600))
+STRUCTURE_STORE_MAX_ENTRIES = int(os.environ.get("STRUCTURE_STORE_MAX_ENTRIES", 5000))
+STRUCTURE_STORE_MAX_BYTES = int(os.environ.get("STRUCTURE_STORE_MAX_BYTES", 256 * 1024 * 1024))
+
+# --- Google İstek Sınırları ---
+# gthread worker'larında her thread ağ beklerken diğerleri çalışır; bu sınırlar
+# bir worker'ın aynı anda Google'a açabileceği istek sayısını kontrol altında tutar.
+UPSTREAM_MAX_CONCURRENCY = int(os.environ.get("UPSTREAM_MAX_CONCURRENCY", 32))
+UPSTREAM_PER_HOST_LIMIT = int(os.environ.get("UPSTREAM_PER_HOST_LIMIT", 16))
+UPSTREAM_QUEUE_TIMEOUT = float(os.environ.get("UPSTREAM_QUEUE_TIMEOUT", 20))
+# Test ve benchmark için: docs.google.com / forms.gle istekleri bu adrese yönlendirilir
+UPSTREAM_BASE_URL = os.environ.get("UPSTREAM_BASE_URL", "").rstrip('/')
+
+# --- HTTP Bağlantı Havuzu ---
+HTTP_POOL_SIZE = int(os.environ.get("HTTP_POOL_SIZE", UPSTREAM_PER_HOST_LIMIT))
+HTTP_RETRIES = int(os.environ.get("HTTP_RETRIES", 2))
+HTTP_RETRY_BACKOFF = float(os.environ.get("HTTP_RETRY_BACKOFF", 0.5))
+# Form sayfası isteğinin (bağlantı/okuma) zaman aşımı, saniye
+FORM_FETCH_TIMEOUT = 15
+# Çözülmüş forms.gle kısa linkleri bu süre boyunca HEAD isteği atılmadan kullanılır
+SHORT_LINK_TTL = int(os.environ.get("SHORT_LINK_TTL", 24 * 3600))
+
+
+# --- Anahtar/Değer Depoları ---
+class MemoryStore:
+    """
+    İşlem içi, LRU tahliyeli anahtar/değer deposu.
+    Değerler bytes olarak tutulur; hem kayıt sayısı hem de toplam boyut sınırlanır.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data = OrderedDict()  # key -> (value, expires_at)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at is not None and expires_at <= time.time():
+                self._remove(key)
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: float = None):
+        if len(value) > self.max_bytes:
+            return
+        expires_at = time.time() + ttl if ttl else None
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (value, expires_at)
+            self._bytes += len(value)
+            while self._data and (len(self._data) > self.max_entries or self._bytes > self.max_bytes):
+                self._remove(next(iter(self._data)))
+
+    def delete(self, key: str):
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+
+    def _remove(self, key: str):
+        value, _ = self._data.pop(key)
+        self._bytes -= len(value)
+
+
+class SQLiteStore:
+    """
+    Aynı makinedeki tüm worker'ların paylaştığı, SQLite tabanlı anahtar/değer deposu.
+    Erişim zamanına göre LRU tahliyesi yapar; her thread kendi bağlantısını kullanır.
+    Okumalar yazma kilidi almaz: erişim zamanı en fazla ACCESS_UPDATE_INTERVAL saniyede bir güncellenir,
+    süresi dolmuş kayıtlar ise bir sonraki set() sırasında silinir.
+    """
+
+    ACCESS_UPDATE_INTERVAL = 60
+
+    def __init__(self, path: str, table: str, max_entries: int, max_bytes: int):
+        self.path = path
+        self.table = table
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        # Şema kısa ömürlü bir bağlantıyla kurulur; böylece fork öncesinde açık bağlantı kalmaz
+        conn = sqlite3.connect(path, timeout=10, isolation_level=None)
+        try:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, "
+                "expires_at REAL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_accessed ON {table} (accessed_at)")
+        finally:
+            conn.close()
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str):
+        now = time.time()
+        conn = self._conn()
+        row = conn.execute(f"SELECT value, expires_at, accessed_at FROM {self.table} WHERE key = ?",
+                           (key,)).fetchone()
+        if row is None or (row[1] is not None and row[1] <= now):
+            return None
+        if row[2] < now - self.ACCESS_UPDATE_INTERVAL:
+            conn.execute(f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key))
+        return row[0]
+
+    def set(self, key: str, value: bytes, ttl: float = None):
+        if len(value) > self.max_bytes:
+            return
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value), now + ttl if ttl else None, now),
+            )
+            conn.execute(f"DELETE FROM {self.table} WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+            count, total = conn.execute(f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM {self.table}").fetchone()
+            if count > self.max_entries or total > self.max_bytes:
+                # En eski erişilen kayıtlardan başlayarak sınırların altına inene kadar sil
+                victims = []
+                for victim, size in conn.execute(f"SELECT key, size FROM {self.table} ORDER BY accessed_at"):
+                    if count <= self.max_entries and total <= self.max_bytes:
+                        break
+                    victims.append((victim,))
+                    count -= 1
+                    total -= size
+                conn.executemany(f"DELETE FROM {self.table} WHERE key = ?", victims)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def delete(self, key: str):
+        self._conn().execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+
+class TieredStore:
+    """
+    Önce işlem içi belleğe, bulamazsa paylaşılan depoya bakan iki katmanlı depo.
+    Paylaşılan depodan okunan değerler kısa bir süre için belleğe de alınır.
+    """
+
+    def __init__(self, local, shared, local_ttl: float = 60):
+        self.local = local
+        self.shared = shared
+        self.local_ttl = local_ttl
+
+    def get(self, key: str):
+        value = self.local.get(key)
+        if value is None:
+            value = self.shared.get(key)
+            if value is not None:
+                self.local.set(key, value, ttl=self.local_ttl)
+        return value
+
+    def set(self, key: str, value: bytes, ttl: float = None):
+        self.shared.set(key, value, ttl=ttl)
+        self.local.set(key, value, ttl=min(ttl, self.local_ttl) if ttl else self.local_ttl)
+
+    def delete(self, key: str):
+        self.local.delete(key)
+        self.shared.delete(key)
+
+
+def make_store(backend: str, table: str, path: str, max_entries: int, max_bytes: int):
+    """
+    Ayar değerine göre uygun anahtar/değer deposunu oluşturur.
+    'sqlite' seçildiğinde önüne küçük bir bellek katmanı eklenir.
+    """
+    if backend == 'sqlite':
+        local = MemoryStore(max(1, max_entries // 4), max(1, max_bytes // 4))
+        return TieredStore(local, SQLiteStore(path, table, max_entries, max_bytes))
+    return MemoryStore(max_entries, max_bytes)
+
+
+# --- Ölçümler ---
+# /metrics uç noktası Prometheus metin biçiminde sayaç ve histogramları sunar.
+# Değerler worker sürecine özeldir; her worker ayrı bir hedef olarak kazınmalıdır.
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+# SERVER_TIMING=1: her yanıta aşama sürelerini içeren Server-Timing başlığı eklenir
+SERVER_TIMING = os.environ.get("SERVER_TIMING", "0") == "1"
+# PROFILE_SAMPLE_RATE: isteklerin bu oranı (0-1) cProfile ile profillenip PROFILE_DIR'e yazılır
+PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", 0))
+PROFILE_DIR = os.environ.get("PROFILE_DIR", os.path.join(tempfile.gettempdir(), "formklon_profiles"))
+
+STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+PAYLOAD_BUCKETS = (10_000, 50_000, 100_000, 250_000, 500_000, 1_000_000, 2_500_000, 5_000_000)
+QUESTION_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000)
+
+
+class Metrics:
+    """Thread-safe sayaç ve histogram kaydı; render() Prometheus metin biçimini üretir."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._meta = {}        # ad -> (tip, açıklama, kovalar)
+        self._counters = {}    # (ad, etiketler) -> değer
+        self._histograms = {}  # (ad, etiketler) -> [kova sayıları, toplam, adet]
+
+    def describe(self, name: str, kind: str, help_text: str, buckets=None):
+        self._meta[name] = (kind, help_text, buckets)
+
+    def inc(self, name: str, labels=(), value: float = 1):
+        with self._lock:
+            key = (name, labels)
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, labels=()):
+        buckets = self._meta[name][2]
+        with self._lock:
+            hist = self._histograms.get((name, labels))
+            if hist is None:
+                hist = self._histograms[(name, labels)] = [[0] * len(buckets), 0.0, 0]
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    hist[0][i] += 1
+            hist[1] += value
+            hist[2] += 1
+
+    @staticmethod
+    def _labels(labels, extra=()):
+        pairs = tuple(labels) + tuple(extra)
+        if not pairs:
+            return ''
+        escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in pairs)
+        return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + '}'
+
+    def render(self) -> str:
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {key: (list(h[0]), h[1], h[2]) for key, h in self._histograms.items()}
+        lines = []
+        for name, (kind, help_text, buckets) in self._meta.items():
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            if kind == 'counter':
+                for (metric, labels), value in sorted(counters.items()):
+                    if metric == name:
+                        lines.append(f'{name}{self._labels(labels)} {value}')
+            else:
+                for (metric, labels), (counts, total, count) in sorted(histograms.items()):
+                    if metric != name:
+                        continue
+                    for bound, bucket_count in zip(buckets, counts):
+                        lines.append(f'{name}_bucket{self._labels(labels, (("le", bound),))} {bucket_count}')
+                    lines.append(f'{name}_bucket{self._labels(labels, (("le", "+Inf"),))} {count}')
+                    lines.append(f'{name}_sum{self._labels(labels)} {total}')
+                    lines.append(f'{name}_count{self._labels(labels)} {count}')
+        return '\n'.join(lines) + '\n'
+
+
+metrics = Metrics()
+metrics.describe('formklon_stage_seconds', 'histogram', "İşlem aşamalarının süresi (saniye).", STAGE_BUCKETS)
+metrics.describe('formklon_cache_total', 'counter',
+                 "Önbellek sonuçları (cache: form|short_link|image|fingerprint, result: hit|miss|revalidated|stale).")
+metrics.describe('formklon_upstream_errors_total', 'counter', "Google isteklerindeki hatalar (HTTP durumu, timeout, connection, busy).")
+metrics.describe('formklon_payload_bytes', 'histogram', "İndirilen form sayfası boyutu (bayt).", PAYLOAD_BUCKETS)
+metrics.describe('formklon_form_questions', 'histogram', "Analiz edilen formlardaki soru sayısı.", QUESTION_BUCKETS)
+metrics.describe('formklon_requests_total', 'counter', "Sunulan HTTP istekleri (endpoint, status).")
+metrics.describe('formklon_store_errors_total', 'counter',
+                 "İsteği durdurmayan kalıcı kayıt hataları (store: responses|history|forward).")
+
+
+def record_stage(stage: str, seconds: float):
+    """Aşama süresini histograma ve (istek içindeyse) Server-Timing listesine ekler."""
+    metrics.observe('formklon_stage_seconds', seconds, (('stage', stage),))
+    if has_request_context():
+        g.setdefault('stage_timings', []).append((stage, seconds))
+
+
+@contextmanager
+def span(stage: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, time.perf_counter() - started)
+
+
+def upstream_error_kind(exc) -> str:
+    """Hata sayacında kullanılacak etiket: HTTP durum kodu, 'timeout', 'connection', 'busy' veya 'other'."""
+    import requests
+
+    if isinstance(exc, UpstreamBusy):
+        return 'busy'
+    response = getattr(exc, 'response', None)
+    if response is not None:
+        return str(response.status_code)
+    if isinstance(exc, requests.Timeout):
+        return 'timeout'
+    if isinstance(exc, requests.ConnectionError):
+        return 'connection'
+    return 'other'
+
+
+# --- Google'a Giden İstekler ---
+class UpstreamBusy(Exception):
+    """Eşzamanlılık sınırı dolu olduğu için istek zamanında başlatılamadı."""
+
+
+_upstream_slots = threading.BoundedSemaphore(UPSTREAM_MAX_CONCURRENCY)
+_host_slots = {}
+_host_slots_lock = threading.Lock()
+
+
+def _host_semaphore(host: str):
+    with _host_slots_lock:
+        sem = _host_slots.get(host)
+        if sem is None:
+            sem = _host_slots[host] = threading.BoundedSemaphore(UPSTREAM_PER_HOST_LIMIT)
+        return sem
+
+
+@contextmanager
+def upstream_slot(url: str):
+    """
+    Önce hedef sunucuya, sonra genel havuza ait bir yer ayırır.
+    UPSTREAM_QUEUE_TIMEOUT içinde yer bulunamazsa UpstreamBusy fırlatır.
+    """
+    deadline = time.monotonic() + UPSTREAM_QUEUE_TIMEOUT
+    host_sem = _host_semaphore(urlsplit(url).netloc)
+    if not host_sem.acquire(timeout=UPSTREAM_QUEUE_TIMEOUT):
+        raise UpstreamBusy("Sunucu şu anda çok yoğun, lütfen biraz sonra tekrar deneyin.")
+    try:
+        if not _upstream_slots.acquire(timeout=max(0, deadline - time.monotonic())):
+            raise UpstreamBusy("Sunucu şu anda çok yoğun, lütfen biraz sonra tekrar deneyin.")
+        try:
+            yield
+        finally:
+            _upstream_slots.release()
+    finally:
+        host_sem.release()
+
+
+def _rewrite_upstream_url(url: str) -> str:
+    if not UPSTREAM_BASE_URL:
+        return url
+    for prefix, target in (('https://docs.google.com/', '/'), ('https://forms.gle/', '/forms.gle/')):
+        if url.startswith(prefix):
+            return UPSTREAM_BASE_URL + target + url[len(prefix):]
+    return url
+
+
+UPSTREAM_HEADERS = {
+    'User-Agent': ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
+                   'AppleWebKit/537.36 (KHTML, like Gecko) '
+                   'Chrome/124.0.0.0 Safari/537.36'),
+    'Accept-Encoding': 'gzip, deflate',
+}
+
+_http_session = None
+_http_session_lock = threading.Lock()
+
+
+def get_http_session():
+    """
+    İşlem genelinde paylaşılan, keep-alive bağlantı havuzlu oturumu döndürür.
+    Gunicorn fork'undan sonra her worker ilk kullanımda kendi havuzunu kurar.
+    5xx yanıtlarında ve bağlantı hatalarında artan beklemeyle yeniden dener. 429 yeniden denenmez:
+    engellenmiş istek sayılır ve tarayıcı yedeğine bırakılır. Retry-After başlığına uyulmaz; sınırsız
+    bir bekleme upstream_slot yerlerini ve istek thread'ini tutar, birleştirme süresini (leader_budget) aşar.
+    """
+    global _http_session
+    if _http_session is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        with _http_session_lock:
+            if _http_session is None:
+                retry = Retry(
+                    total=HTTP_RETRIES, backoff_factor=HTTP_RETRY_BACKOFF,
+                    status_forcelist=(500, 502, 503, 504), allowed_methods=frozenset({'HEAD', 'GET'}),
+                    respect_retry_after_header=False, raise_on_status=False,
+                )
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=HTTP_POOL_SIZE, max_retries=retry)
+                session_ = requests.Session()
+                session_.headers.update(UPSTREAM_HEADERS)
+                session_.mount('https://', adapter)
+                session_.mount('http://', adapter)
+                _http_session = session_
+    return _http_session
+
+
+def upstream_request(method: str, url: str, **kwargs):
+    """Google'a giden tüm istekler buradan geçer; eşzamanlılık sınırlarını ve bağlantı havuzunu uygular."""
+    url = _rewrite_upstream_url(url)
+    with upstream_slot(url):
+        return get_http_session().request(method, url, **kwargs)
+
+
+# --- Tarayıcı Havuzu ---
+# Düz HTTP isteği engellendiğinde (403/429) veya sayfada FB_PUBLIC_LOAD_DATA_ bulunamadığında
+# form, sıcak tutulan Playwright tarayıcı bağlamlarından biriyle yeniden indirilir.
+# Playwright kurulu değilse (pip install playwright && playwright install chromium) yedek yol kapalıdır.
+BROWSER_FALLBACK = os.environ.get("BROWSER_FALLBACK", "1") == "1"
+BROWSER_POOL_SIZE = int(os.environ.get("BROWSER_POOL_SIZE", 2))
+BROWSER_PAGES_PER_CONTEXT = int(os.environ.get("BROWSER_PAGES_PER_CONTEXT", 50))
+BROWSER_QUEUE_SIZE = int(os.environ.get("BROWSER_QUEUE_SIZE", 32))
+BROWSER_QUEUE_TIMEOUT = float(os.environ.get("BROWSER_QUEUE_TIMEOUT", 15))
+BROWSER_NAV_TIMEOUT = float(os.environ.get("BROWSER_NAV_TIMEOUT", 20))
+BROWSER_BLOCKED_RESOURCES = frozenset(('image', 'media', 'font'))
+BLOCKED_STATUSES = frozenset((401, 403, 429))
+
+
+def is_blocked_error(exc) -> bool:
+    response = getattr(exc, 'response', None)
+    return response is not None and response.status_code in BLOCKED_STATUSES
+
+metrics.describe('formklon_browser_fallback_total', 'counter',
+                 "Tarayıcı ile yeniden indirme denemeleri (reason: blocked|no_data, result: ok|error|busy).")
+
+
+class BrowserPool:
+    """
+    Sabit sayıda tarayıcı thread'i. Playwright'ın senkron API'si nesneleri oluşturan thread'e bağlı
+    olduğundan her thread kendi tarayıcısını ve bağlamını tutar; işler ortak bir kuyruktan dağıtılır.
+    Bağlamlar pages_per_context sayfadan sonra yenilenir, böylece çerez/bellek birikmez.
+    Thread'ler ilk kullanımda başlatılır (gunicorn --preload ile fork öncesinde tarayıcı açılmaz).
+    """
+
+    def __init__(self, size: int, pages_per_context: int, queue_size: int):
+        self.size = size
+        self.pages_per_context = pages_per_context
+        self._jobs = queue.Queue(maxsize=queue_size)
+        self._threads = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def available() -> bool:
+        return importlib.util.find_spec('playwright') is not None
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._threads:
+                return
+            for n in range(self.size):
+                thread = threading.Thread(target=self._worker, name=f'formklon-browser-{n}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def fetch(self, url: str, queue_timeout: float = BROWSER_QUEUE_TIMEOUT,
+              nav_timeout: float = BROWSER_NAV_TIMEOUT) -> str:
+        """
+        Sayfayı havuzdaki bir tarayıcıyla açar ve son HTML'i döndürür.
+        Kuyruk dolu ya da iş zamanında başlatılamadıysa UpstreamBusy fırlatır.
+        """
+        from concurrent.futures import Future, TimeoutError as FutureTimeout
+
+        self._ensure_started()
+        future = Future()
+        deadline = time.monotonic() + queue_timeout
+        try:
+            self._jobs.put((future, url, nav_timeout, deadline), timeout=queue_timeout)
+        except queue.Full:
+            raise UpstreamBusy("Tarayıcı havuzu şu anda çok yoğun, lütfen biraz sonra tekrar deneyin.")
+        try:
+            return future.result(timeout=queue_timeout + nav_timeout)
+        except FutureTimeout:
+            # Henüz başlamadıysa iptal edilir; thread iptal edilmiş işi atlar.
+            future.cancel()
+            raise UpstreamBusy("Tarayıcı ile sayfa zamanında yüklenemedi.")
+
+    def _new_context(self, browser):
+        context = browser.new_context(user_agent=UPSTREAM_HEADERS['User-Agent'], locale='tr-TR')
+
+        def block_heavy(route):
+            if route.request.resource_type in BROWSER_BLOCKED_RESOURCES:
+                route.abort()
+            else:
+                route.continue_()
+
+        context.route('**/*', block_heavy)
+        return context
+
+    def _worker(self):
+        from playwright.sync_api import sync_playwright
+
+        playwright = browser = context = None
+        pages = 0
+        while True:
+            future, url, nav_timeout, deadline = self._jobs.get()
+            if time.monotonic() > deadline or not future.set_running_or_notify_cancel():
+                if not future.done():
+                    future.set_exception(UpstreamBusy("Tarayıcı kuyruğunda bekleme süresi doldu."))
+                continue
+            try:
+                if browser is None or not browser.is_connected():
+                    if playwright is None:
+                        playwright = sync_playwright().start()
+                    browser = playwright.chromium.launch(headless=True)
+                    context, pages = None, 0
+                if context is None or pages >= self.pages_per_context:
+                    if context is not None:
+                        context.close()
+                    context, pages = self._new_context(browser), 0
+                page = context.new_page()
+                pages += 1
+                try:
+                    response = page.goto(url, wait_until='domcontentloaded', timeout=nav_timeout * 1000)
+                    if response is not None and response.status >= 400:
+                        raise RuntimeError(f"Tarayıcı isteği {response.status} durum koduyla döndü")
+                    future.set_result(page.content())
+                finally:
+                    page.close()
+            except Exception as e:
+                future.set_exception(e)
+                # Bağlam veya tarayıcı bozulmuş olabilir; bir sonraki işte baştan kurulur.
+                for closable in (context, browser):
+                    try:
+                        if closable is not None:
+                            closable.close()
+                    except Exception:
+                        pass
+                browser = context = None
+
+
+browser_pool = BrowserPool(BROWSER_POOL_SIZE, BROWSER_PAGES_PER_CONTEXT, BROWSER_QUEUE_SIZE)
+
+
+def browser_fetch_form(url: str, reason: str):
+    """Tarayıcı havuzuyla indirilen HTML'i döndürür; yedek yol kapalıysa veya başarısızsa None."""
+    if not BROWSER_FALLBACK or not BrowserPool.available():
+        return None
+    labels = (('reason', reason),)
+    try:
+        with span('browser_fetch'):
+            html = browser_pool.fetch(_rewrite_upstream_url(url))
+    except UpstreamBusy:
+        metrics.inc('formklon_browser_fallback_total', labels + (('result', 'busy'),))
+        return None
+    except Exception:
+        metrics.inc('formklon_browser_fallback_total', labels + (('result', 'error'),))
+        return None
+    metrics.inc('formklon_browser_fallback_total', labels + (('result', 'ok'),))
+    return html
+
+
+# --- İstek Birleştirme ---
+# Aynı form için aynı anda gelen analizler tek bir indirme/ayrıştırmayı bekler. Worker içinde
+# thread'ler ortak bir Future'ı, worker'lar arasında ise form başına bir dosya kilidini paylaşır;
+# kilidi alan worker önce paylaşılan önbelleğe bakar. Dosya kilidi yalnızca önbellek worker'lar
+# arasında paylaşılıyorsa (FORM_CACHE_BACKEND=sqlite) anlamlıdır ve varsayılan olarak o zaman açılır.
+# Bekleme süresi dolan istekler formu kendileri indirmez (yavaş Google'a yığılma olmasın);
+# eski önbellek kaydını veya "meşgul" hatasını alır.
+
+
+def leader_budget() -> float:
+    """Liderin en kötü durumda harcayabileceği süre: sıra bekleme, yeniden denemeli GET ve tarayıcı yedeği."""
+    fetch = UPSTREAM_QUEUE_TIMEOUT + (HTTP_RETRIES + 1) * FORM_FETCH_TIMEOUT \
+        + sum(HTTP_RETRY_BACKOFF * 2 ** n for n in range(HTTP_RETRIES))
+    browser = BROWSER_QUEUE_TIMEOUT + BROWSER_NAV_TIMEOUT if BROWSER_FALLBACK else 0
+    return fetch + browser + 5
+
+
+COALESCE_TIMEOUT = float(os.environ.get("COALESCE_TIMEOUT") or leader_budget())
+COALESCE_ACROSS_WORKERS = os.environ.get(
+    "COALESCE_ACROSS_WORKERS", "1" if FORM_CACHE_BACKEND == 'sqlite' else "0") == "1"
+COALESCE_LOCK_DIR = os.environ.get("COALESCE_LOCK_DIR", os.path.join(tempfile.gettempdir(), "formklon_locks"))
+
+metrics.describe('formklon_coalesced_total', 'counter',
+                 "Birleştirilen analizler (role: follower|lock_wait|timeout).")
+
+
+class SingleFlight:
+    """
+    Aynı anahtar için eşzamanlı run() çağrılarından yalnızca ilki (lider) fn'i çalıştırır,
+    diğerleri sonucunu paylaşır. Lider timeout içinde bitiremezse bekleyenler fn'i çalıştırmaz,
+    on_timeout() sonucunu döndürür. lock_dir verilirse lider, aynı anahtarı işleyen diğer süreçleri
+    de bir dosya kilidiyle bekler; kilit dosyası kilidi bırakan süreç tarafından silinir.
+    """
+
+    def __init__(self, timeout: float, lock_dir: str = None):
+        self.timeout = timeout
+        self.lock_dir = lock_dir
+        self._lock = threading.Lock()
+        self._flights = {}
+
+    def run(self, key: str, fn, on_timeout):
+        from concurrent.futures import Future, TimeoutError as FutureTimeout
+
+        with self._lock:
+            future = self._flights.get(key)
+            leader = future is None
+            if leader:
+                future = self._flights[key] = Future()
+        if not leader:
+            try:
+                result = future.result(timeout=self.timeout)
+            except FutureTimeout:
+                metrics.inc('formklon_coalesced_total', (('role', 'timeout'),))
+                return on_timeout()
+            metrics.inc('formklon_coalesced_total', (('role', 'follower'),))
+            return dict(result)
+        try:
+            with self._process_lock(key) as locked:
+                result = fn() if locked else on_timeout()
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+
+    @contextmanager
+    def _process_lock(self, key: str):
+        """
+        Anahtara özel dosya kilidi (fcntl.flock); kilit alınabildiyse True verir, timeout dolarsa False.
+        Kilit sahibi dosyayı kilidi bırakmadan önce siler; eski dosyada kilit alan süreç yolun artık
+        başka bir dosyayı gösterdiğini görüp yeniden dener, böylece iki süreç aynı anda lider olamaz.
+        """
+        try:
+            import fcntl
+        except ImportError:  # Windows
+            fcntl = None
+        if not self.lock_dir or fcntl is None:
+            yield True
+            return
+        os.makedirs(self.lock_dir, exist_ok=True)
+        path = os.path.join(self.lock_dir, hashlib.sha1(key.encode('utf-8')).hexdigest() + '.lock')
+        deadline = time.monotonic() + self.timeout
+        locked = waited = False
+        while True:
+            fh = open(path, 'ab')
+            while True:
+                try:
+                    fcntl.flock(fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    locked = True
+                    break
+                except BlockingIOError:
+                    if time.monotonic() >= deadline:
+                        break
+                    waited = True
+                    time.sleep(0.05)
+            if not locked:
+                break
+            try:
+                current = os.stat(path).st_ino == os.fstat(fh.fileno()).st_ino
+            except FileNotFoundError:
+                current = False
+            if current:
+                break
+            fcntl.flock(fh, fcntl.LOCK_UN)  # önceki sahip dosyayı silmiş; yeni dosyada tekrar dene
+            fh.close()
+            locked = False
+        if locked and waited:
+            metrics.inc('formklon_coalesced_total', (('role', 'lock_wait'),))
+        elif not locked:
+            metrics.inc('formklon_coalesced_total', (('role', 'timeout'),))
+        try:
+            yield locked
+        finally:
+            if locked:
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+                fcntl.flock(fh, fcntl.LOCK_UN)
+            fh.close()
+
+
+form_flights = SingleFlight(COALESCE_TIMEOUT, COALESCE_LOCK_DIR if COALESCE_ACROSS_WORKERS else None)
+
+
+# --- Form Yapısı Önbelleği ---
+FORM_ID_RE = re.compile(r'/forms/d/e/([A-Za-z0-9_-]+)')
+
+
+def canonical_form_url(url: str) -> str:
+    """Form URL'sini önbellek anahtarı olarak kullanılacak kanonik '/forms/d/e/<id>' biçimine getirir."""
+    match = FORM_ID_RE.search(url)
+    if match:
+        return f"https://docs.google.com/forms/d/e/{match.group(1)}/viewform"
+    return url.split('#', 1)[0]
+
+
+def form_id_from_url(url: str) -> str:
+    """Yanıtların gruplanacağı form kimliği: '/forms/d/e/<id>' içindeki <id>, yoksa URL'nin özeti."""
+    match = FORM_ID_RE.search(url)
+    if match:
+        return match.group(1)
+    return hashlib.sha1(url.encode('utf-8')).hexdigest()[:20]
+
+
+class FormCache:
+    """
+    Ayrıştırılmış form_data'yı kanonik form URL'sine göre saklar.
+    TTL dolduğunda kayıt hemen atılmaz; kaynak ETag/Last-Modified verdiyse
+    koşullu istekle yeniden doğrulanır ve 304 gelirse tekrar tazelenir.
+    """
+
+    def __init__(self, store, ttl: int):
+        self.store = store
+        self.ttl = ttl
+
+    def get(self, key: str):
+        raw = self.store.get(key)
+        if raw is None:
+            return None
+        payload = unpack(raw)
+        try:
+            stored_at, etag, last_modified, form_payload = payload
+            form_data = FormStructure.from_payload(form_payload)
+        except (IndexError, TypeError, ValueError):
+            # Eski sürümle yazılmış veya bozuk kayıt: ıska say
+            self.store.delete(key)
+            return None
+        return {'form_data': form_data, 'etag': etag, 'last_modified': last_modified, 'stored_at': stored_at}
+
+    def is_fresh(self, entry) -> bool:
+        return time.time() - entry['stored_at'] < self.ttl
+
+    def put(self, key: str, form_data, etag=None, last_modified=None):
+        self.store.set(key, pack([time.time(), etag, last_modified, form_data.to_payload()]))
+
+    def touch(self, key: str, entry):
+        self.put(key, entry['form_data'], entry['etag'], entry['last_modified'])
+
+
+form_cache = FormCache(
+    make_store(FORM_CACHE_BACKEND, 'form_cache', FORM_CACHE_PATH, FORM_CACHE_MAX_ENTRIES, FORM_CACHE_MAX_BYTES),
+    FORM_CACHE_TTL,
+)
+
+
+# --- Kısa Link Önbelleği ---
+short_link_store = make_store(
+    FORM_CACHE_BACKEND, 'short_links', FORM_CACHE_PATH, FORM_CACHE_MAX_ENTRIES * 4, 4 * 1024 * 1024,
+)
+
+
+def resolve_short_link(url: str) -> str:
+    """'forms.gle/<kod>' linkini tam form adresine çevirir; sonuç önbellekteyse HEAD isteği atılmaz."""
+    code = url.split('forms.gle/', 1)[1].split('?', 1)[0].split('#', 1)[0].strip('/')
+    key = f'forms.gle/{code}'
+    cached = short_link_store.get(key)
+    if cached is not None:
+        metrics.inc('formklon_cache_total', (('cache', 'short_link'), ('result', 'hit')))
+        return cached.decode('utf-8')
+    metrics.inc('formklon_cache_total', (('cache', 'short_link'), ('result', 'miss')))
+    resp = upstream_request('HEAD', url, allow_redirects=True, timeout=10)
+    resp.raise_for_status()
+    short_link_store.set(key, resp.url.encode('utf-8'), ttl=SHORT_LINK_TTL)
+    return resp.url
+
+
+# --- Form Yapısı Deposu (Session Yerine) ---
+structure_store = make_store(
+    STRUCTURE_STORE_BACKEND, 'form_structures', STRUCTURE_STORE_PATH,
+    STRUCTURE_STORE_MAX_ENTRIES, STRUCTURE_STORE_MAX_BYTES,
+)
+
+
+def save_form_structure(form_data) -> str:
+    """Form yapısını sunucu tarafında saklar ve sayfaya yazılacak kısa, tahmin edilemez bir anahtar döndürür."""
+    token = secrets.token_urlsafe(16)
+    structure_store.set(token, encode_form(form_data), ttl=STRUCTURE_STORE_TTL)
+    return token
+
+
+def load_form_structure(token: str):
+    """Anahtara karşılık gelen form yapısını döndürür; süresi dolmuş veya silinmişse None."""
+    if not token:
+        return None
+    raw = structure_store.get(token)
+    return decode_form(raw) if raw is not None else None
 
 
 def analyze_google_form(url: str):
     """
     Verilen Google Form URL'sini, güvenilir JSON verisi ve HTML'i bir arada kullanarak analiz eder.
-    Zengin metin (linkler dahil) ve zorunlu alan hataları bu fonksiyonda düzeltilmiştir.
+    Sonuç kanonik form URL'sine göre önbelleğe alınır; süresi dolan kayıtlar mümkünse
+    ETag/Last-Modified ile koşullu olarak yeniden doğrulanır. Aynı formun eşzamanlı analizleri
+    tek bir indirmede birleştirilir (bkz. SingleFlight).
     """
+    import requests
+
+    if 'forms.gle/' in url:
+        try:
+            with span('short_link'):
+                url = resolve_short_link(url)
+        except (requests.RequestException, UpstreamBusy) as e:
+            if not is_blocked_error(e):
+                metrics.inc('formklon_upstream_errors_total', (('kind', upstream_error_kind(e)),))
+                return {"error": f"URL alınırken bir hata oluştu: {e}"}
+            # Engellenen kısa link, form sayfasıyla birlikte tarayıcı havuzuna bırakılır
+
+    cache_key = canonical_form_url(url)
+    with span('cache_lookup'):
+        cached = form_cache.get(cache_key)
+    if cached and form_cache.is_fresh(cached):
+        metrics.inc('formklon_cache_total', (('cache', 'form'), ('result', 'hit')))
+        return {"form_data": cached['form_data']}
+    return form_flights.run(cache_key, lambda: fetch_google_form(url, cache_key),
+                            lambda: coalesce_timeout_result(cache_key))
+
+
+def coalesce_timeout_result(cache_key: str):
+    """Süren analiz zamanında bitmediğinde: varsa süresi dolmuş önbellek kaydı, yoksa "meşgul" hatası."""
+    cached = form_cache.get(cache_key)
+    if cached:
+        metrics.inc('formklon_cache_total', (('cache', 'form'), ('result', 'stale')))
+        return {"form_data": cached['form_data']}
+    return {"error": "Bu form şu anda analiz ediliyor ve Google yavaş yanıt veriyor; lütfen biraz sonra tekrar deneyin."}
+
+
+def fetch_google_form(url: str, cache_key: str):
+    """
+    Formu indirip ayrıştırır ve önbelleğe yazar. İstek engellenirse veya sayfada form verisi
+    yoksa tarayıcı havuzu (bkz. BrowserPool) denenir.
+    """
+    import requests
+
     try:
-        headers = {
-            'User-Agent': ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
-                           'AppleWebKit/537.36 (KHTML, like Gecko) '
-                           'Chrome/124.0.0.0 Safari/537.36')
-        }
-        if 'forms.gle/' in url:
-            resp = requests.head(url, allow_redirects=True, timeout=10, headers=headers)
-            resp.raise_for_status()
-            url = resp.url
-        
-        resp = requests.get(url, headers=headers, timeout=15)
+        headers = {}
+        # Beklerken başka bir thread veya worker formu önbelleğe yazmış olabilir
+        cached = form_cache.get(cache_key)
+        if cached:
+            if form_cache.is_fresh(cached):
+                metrics.inc('formklon_cache_total', (('cache', 'form'), ('result', 'hit')))
+                return {"form_data": cached['form_data']}
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+
+        with span('fetch'):
+            resp = upstream_request('GET', url, headers=headers, timeout=FORM_FETCH_TIMEOUT)
+        if resp.status_code == 304 and cached:
+            metrics.inc('formklon_cache_total', (('cache', 'form'), ('result', 'revalidated')))
+            form_cache.touch(cache_key, cached)
+            return {"form_data": cached['form_data']}
         resp.raise_for_status()
 
-    except requests.RequestException as e:
-        return {"error": f"URL alınırken bir hata oluştu: {e}"}
+    except (requests.RequestException, UpstreamBusy) as e:
+        metrics.inc('formklon_upstream_errors_total', (('kind', upstream_error_kind(e)),))
+        html = browser_fetch_form(url, 'blocked') if is_blocked_error(e) else None
+        if html is None:
+            return {"error": f"URL alınırken bir hata oluştu: {e}"}
+        resp = None
+    else:
+        html = resp.text
 
-    soup = BeautifulSoup(resp.text, 'html.parser')
-    form_data = {'pages': []}
-    
-    for script in soup.find_all('script'):
-        if script.string and 'FB_PUBLIC_LOAD_DATA_' in script.string:
-            try:
-                raw_json_str = script.string.replace('var FB_PUBLIC_LOAD_DATA_ = ', '').rstrip(';')
-                data = json.loads(raw_json_str)
+    metrics.inc('formklon_cache_total', (('cache', 'form'), ('result', 'miss')))
+    metrics.observe('formklon_payload_bytes', len(resp.content) if resp is not None else len(html.encode('utf-8')))
+    form_id = form_id_from_url(cache_key)
+    with span('fingerprint'):
+        fingerprint = form_fingerprint(html)
+    known = None
+    if form_history and fingerprint:
+        try:
+            known = form_history.lookup(form_id, fingerprint)
+        except sqlite3.Error:
+            history_error(form_id)
+    if known is not None:
+        metrics.inc('formklon_cache_total', (('cache', 'fingerprint'), ('result', 'hit')))
+        result = {"form_data": known}
+    else:
+        if fingerprint:
+            metrics.inc('formklon_cache_total', (('cache', 'fingerprint'), ('result', 'miss')))
+        result = parse_google_form_html(html)
+    if "error" in result and resp is not None and not fingerprint:
+        # Google bazen çerez onayı veya giriş sayfası döndürür; bir tarayıcıyla yeniden denenir.
+        browser_html = browser_fetch_form(url, 'no_data')
+        if browser_html is not None:
+            resp = None
+            fingerprint = form_fingerprint(browser_html)
+            result = parse_google_form_html(browser_html)
+    if "form_data" in result:
+        form = result['form_data']
+        metrics.observe('formklon_form_questions', len(form.columns))
+        if known is None:
+            form.form_id = form_id
+            if not form.response_url and FORM_ID_RE.search(cache_key):
+                form.response_url = cache_key.rsplit('/', 1)[0] + '/formResponse'
+            if form_history and fingerprint:
+                try:
+                    form_history.record(form_id, fingerprint, form)
+                except sqlite3.Error:
+                    history_error(form_id)
+        etag, last_modified = (resp.headers.get('ETag'), resp.headers.get('Last-Modified')) if resp is not None else (None, None)
+        form_cache.put(cache_key, form, etag, last_modified)
+    return result
 
-                form_info = data[1]
-                
-                form_data['title'] = form_info[8] if len(form_info) > 8 and form_info[8] else (form_info[0] or 'İsimsiz Form')
-                
-                # DÜZELTME: ZENGİN METİN AÇIKLAMASI
-                # Açıklamayı JSON yerine doğrudan HTML'den alarak tüm etiketleri (link, liste vb.) koru
-                desc_div = soup.find('div', class_='cBGGJ')
-                form_data['description'] = desc_div.decode_contents().strip() if desc_div else ''
-                
-                question_list = form_info[1]
-                current_page = []
-
-                if data[1][10] and data[1][10][0]:
-                     current_page.append({
-                        'type': 'E-posta', 'text': 'E-posta Adresi',
-                        'description': 'Bu form, e-posta adreslerini toplamak üzere ayarlanmış.',
-                        'entry_id': 'emailAddress', 'required': True
-                    })
+
+def history_error(form_id: str):
+    logger.exception("Form yapı geçmişi okunamadı/yazılamadı (form %s)", form_id)
+    metrics.inc('formklon_store_errors_total', (('store', 'history'),))
+
+
+# --- Soru Modeli ---
+class QuestionKind(str, Enum):
+    """
+    Soru tipleri. Değerler arayüzde ve Excel'de kullanılan Türkçe adlardır; str'den
+    türediği için şablondaki "q.type == 'Başlık'" gibi karşılaştırmalar aynen çalışır.
+    Sıra ikili kodlamada tip numarası olarak kullanılır; yalnızca sona ekleme yapın.
+    """
+    HEADER = 'Başlık'
+    EMAIL = 'E-posta'
+    SHORT_ANSWER = 'Kısa Yanıt'
+    PARAGRAPH = 'Paragraf'
+    MULTIPLE_CHOICE = 'Çoktan Seçmeli'
+    CHECKBOXES = 'Onay Kutuları'
+    DROPDOWN = 'Açılır Liste'
+    LINEAR_SCALE = 'Doğrusal Ölçek'
+    CHOICE_GRID = 'Çoktan Seçmeli Tablo'
+    CHECKBOX_GRID = 'Onay Kutusu Tablosu'
+    DATE = 'Tarih'
+    TIME = 'Saat'
+    RATING = 'Derecelendirme'
+
+    def __str__(self):
+        return self.value
+
+
+KIND_CODES = {kind: code for code, kind in enumerate(QuestionKind)}
+KINDS_BY_CODE = tuple(QuestionKind)
+GRID_KINDS = frozenset({QuestionKind.CHOICE_GRID, QuestionKind.CHECKBOX_GRID})
+# Seçenekleri (metin, görsel) kaydı olan tipler; diğerlerinde seçenekler düz metindir
+RICH_OPTION_KINDS = frozenset({QuestionKind.MULTIPLE_CHOICE, QuestionKind.CHECKBOXES})
+
+
+class Option(NamedTuple):
+    text: str
+    image_url: Optional[str] = None
+
+
+class GridRow(NamedTuple):
+    text: str
+    entry_id: str
+    label: str
+
+
+class Question:
+    """Tek bir soru veya bölüm başlığı. Kullanılmayan alanlar boş demet / None kalır."""
+
+    __slots__ = ('kind', 'text', 'description', 'image_url', 'entry_id', 'required', 'label',
+                 'options', 'has_other', 'labels', 'cols', 'rows')
+
+    def __init__(self, kind, text='', description='', image_url=None, entry_id=None, required=False, label='',
+                 options=(), has_other=False, labels=(), cols=(), rows=()):
+        self.kind = kind
+        self.text = text
+        self.description = description
+        self.image_url = image_url
+        self.entry_id = entry_id
+        self.required = required
+        self.label = label
+        self.options = options
+        self.has_other = has_other
+        self.labels = labels
+        self.cols = cols
+        self.rows = rows
+
+    @property
+    def type(self):
+        return self.kind
+
+    def to_dict(self):
+        """Eski sözlük biçimi; JSON API çıktılarında kullanılır."""
+        data = {'type': self.kind.value, 'text': self.text, 'description': self.description}
+        if self.kind is not QuestionKind.EMAIL:
+            data['image_url'] = self.image_url
+        if self.kind is QuestionKind.HEADER:
+            return data
+        data.update(entry_id=self.entry_id, required=self.required, label=self.label)
+        if self.kind in RICH_OPTION_KINDS:
+            data['options'] = [o._asdict() for o in self.options]
+            data['has_other'] = self.has_other
+        elif self.kind in (QuestionKind.DROPDOWN, QuestionKind.LINEAR_SCALE, QuestionKind.RATING):
+            data['options'] = list(self.options)
+        if self.kind is QuestionKind.LINEAR_SCALE:
+            data['labels'] = list(self.labels)
+        if self.kind in GRID_KINDS:
+            data['cols'] = list(self.cols)
+            data['rows'] = [r._asdict() for r in self.rows]
+        return data
+
+    def to_payload(self):
+        """İkili kodlama için konumsal liste."""
+        options = [list(o) for o in self.options] if self.kind in RICH_OPTION_KINDS else list(self.options)
+        return [KIND_CODES[self.kind], self.text, self.description, self.image_url, self.entry_id, self.required,
+                self.label, options, self.has_other, list(self.labels), list(self.cols),
+                [list(r) for r in self.rows]]
+
+    @classmethod
+    def from_payload(cls, p):
+        kind = KINDS_BY_CODE[p[0]]
+        options = tuple(Option(*o) for o in p[7]) if kind in RICH_OPTION_KINDS else tuple(p[7])
+        return cls(kind, p[1], p[2], p[3], p[4], p[5], p[6], options, p[8], tuple(p[9]), tuple(p[10]),
+                   tuple(GridRow(*r) for r in p[11]))
+
+
+class FormStructure:
+    """
+    Analiz edilmiş form. Bölümler soru demetlerinden oluşur.
+    'columns' cevap sütunlarını (tablolarda satır başına bir sütun) sırasıyla bir kez hesaplanmış olarak tutar.
+    'response_url' yanıtların iletileceği asıl formun formResponse adresidir (bilinmiyorsa None).
+    """
+
+    __slots__ = ('form_id', 'title', 'description', 'pages', 'response_url', 'columns')
+
+    def __init__(self, form_id, title, description, pages, response_url=None):
+        self.form_id = form_id
+        self.title = title
+        self.description = description
+        self.pages = pages
+        self.response_url = response_url
+        columns = []
+        for page in pages:
+            for q in page:
+                if q.kind is QuestionKind.HEADER:
+                    continue
+                if q.kind in GRID_KINDS:
+                    for row in q.rows:
+                        columns.append((row.entry_id, row.label or f"{q.label} [{row.text}]", q.kind))
+                elif q.entry_id:
+                    columns.append((q.entry_id, q.label or question_label(q.text, q.kind), q.kind))
+        self.columns = tuple(columns)
+
+    def questions(self):
+        for page in self.pages:
+            yield from page
+
+    def to_dict(self):
+        return {'form_id': self.form_id, 'title': self.title, 'description': self.description,
+                'response_url': self.response_url, 'pages': [[q.to_dict() for q in page] for page in self.pages]}
+
+    def to_payload(self):
+        return [self.form_id, self.title, self.description, [[q.to_payload() for q in page] for page in self.pages],
+                self.response_url]
+
+    @classmethod
+    def from_payload(cls, p):
+        return cls(p[0], p[1], p[2], tuple(tuple(Question.from_payload(q) for q in page) for page in p[3]), p[4])
+
+
+# İkili kodlamanın sürümü; konumsal düzen değişirse artırın. Eski sürümlü kayıtlar
+# okunmaz, önbellek ıskası gibi davranılır.
+FORM_FORMAT_VERSION = 2
+
+
+def pack(payload) -> bytes:
+    """Sürüm baytı + msgpack gövdesi."""
+    import msgpack
+
+    return bytes((FORM_FORMAT_VERSION,)) + msgpack.packb(payload, use_bin_type=True)
+
+
+def unpack(raw: bytes):
+    """pack() çıktısını çözer; sürüm uyuşmazsa veya veri bozuksa None döndürür."""
+    import msgpack
+
+    if not raw or raw[0] != FORM_FORMAT_VERSION:
+        return None
+    try:
+        return msgpack.unpackb(raw[1:], raw=False)
+    except (ValueError, msgpack.UnpackException):
+        return None
+
+
+def encode_form(form: FormStructure) -> bytes:
+    return pack(form.to_payload())
+
+
+def decode_form(raw: bytes):
+    payload = unpack(raw)
+    if payload is None:
+        return None
+    try:
+        return FormStructure.from_payload(payload)
+    except (IndexError, TypeError, ValueError):
+        return None
+
+
+# --- Ayrıştırma Motoru ---
+# HTML_PARSER: 'html.parser' (varsayılan) veya 'lxml'. lxml daha hızlıdır ama hatalı iç içe etiketleri
+# (ör. <p> içinde <div>) farklı onarır; zengin metin açıklaması html.parser çıktısından farklı olabilir.
+HTML_PARSER = os.environ.get("HTML_PARSER", "html.parser").lower()
+FB_LOAD_DATA_RE = re.compile(r'FB_PUBLIC_LOAD_DATA_\s*=\s*')
+FORM_ACTION_RE = re.compile(r'<form[^>]+action="(https://docs\.google\.com/forms/[^"]+/formResponse)"')
+_JSON_DECODER = json.JSONDecoder()
+
+
+@lru_cache(maxsize=None)
+def bs4_parser() -> str:
+    """Kullanılacak bs4 ağaç kurucusu; lxml istenmiş ama kurulu değilse html.parser'a düşülür."""
+    if HTML_PARSER == 'lxml' and importlib.util.find_spec('lxml'):
+        return 'lxml'
+    return 'html.parser'
+
+
+def build_item_index(html: str):
+    """
+    Sayfayı bir kez ağaca çevirip form açıklamasını ve her 'data-item-id' kapsayıcısındaki
+    seçenek görsellerini çıkarır. Soru başına tüm belgede arama yapılmaz.
+    Dönüş: (açıklama_html, {item_id: [seçenek sırasına göre görsel URL'si veya None]})
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, bs4_parser())
+
+    desc_div = soup.find('div', class_='cBGGJ')
+    description = desc_div.decode_contents().strip() if desc_div else ''
+
+    option_images = {}
+    for container in soup.find_all('div', attrs={'data-item-id': True}):
+        item_id = container['data-item-id']
+        if item_id in option_images:
+            continue  # soup.find ile aynı davranış: ilk eşleşen kapsayıcı geçerlidir
+        images = []
+        for opt in container.select('.docssharedWizToggleLabeledContainer'):
+            img_tag = opt.select_one('img.L05vke')
+            images.append(img_tag.get('src') if img_tag else None)
+        option_images[item_id] = images
+    return description, option_images
+
+
+def parse_google_form_html(html: str):
+    """
+    Form sayfasının HTML'inden FB_PUBLIC_LOAD_DATA_ JSON'unu ve zengin metin
+    parçalarını okuyarak FormStructure üretir. Sorular ara sözlükler olmadan doğrudan
+    Question / Option / GridRow olarak kurulur.
+    Zengin metin (linkler dahil) ve zorunlu alan hataları bu fonksiyonda düzeltilmiştir.
+    """
+    pages = []
+    title = description = ''
+    action = FORM_ACTION_RE.search(html)
+    response_url = action.group(1) if action else None
+
+    # FB_PUBLIC_LOAD_DATA_ ham metin üzerinde tek geçişte bulunur ve JSON yerinde çözülür;
+    # tüm <script> etiketlerini ağaç olarak gezmeye gerek kalmaz.
+    decode_started = time.perf_counter()
+    match = FB_LOAD_DATA_RE.search(html)
+    if match:
+        try:
+            data, _ = _JSON_DECODER.raw_decode(html, match.end())
+            record_stage('json_decode', time.perf_counter() - decode_started)
+            with span('dom_index'):
+                form_description, option_images = build_item_index(html)
+            walk_started = time.perf_counter()
+
+            form_info = data[1]
+            
+            title = form_info[8] if len(form_info) > 8 and form_info[8] else (form_info[0] or 'İsimsiz Form')
+            
+            # DÜZELTME: ZENGİN METİN AÇIKLAMASI
+            # Açıklamayı JSON yerine doğrudan HTML'den alarak tüm etiketleri (link, liste vb.) koru
+            description = form_description
+            
+            question_list = form_info[1]
+            current_page = []
+
+            if data[1][10] and data[1][10][0]:
+                current_page.append(Question(
+                    QuestionKind.EMAIL, 'E-posta Adresi', 'Bu form, e-posta adreslerini toplamak üzere ayarlanmış.',
+                    entry_id='emailAddress', required=True, label='E-posta Adresi',
+                ))
+            
+            for q in question_list:
+                if not q or not q[0]: continue
+
+                q_id, q_text_plain, q_desc_plain, q_type, q_info = q[0], q[1], q[2], q[3], q[4]
+
+                if q_type == 8:
+                    if current_page:
+                        pages.append(tuple(current_page))
+                    current_page = []
+
+                rich_text_info = q[-1] if isinstance(q[-1], list) else []
+                rich_title = rich_text_info[1] if len(rich_text_info) > 1 and rich_text_info[1] else None
+                rich_desc = rich_text_info[2] if len(rich_text_info) > 2 and rich_text_info[2] else None
                 
-                for q in question_list:
-                    if not q or not q[0]: continue
-
-                    question = {}
-                    q_id, q_text_plain, q_desc_plain, q_type, q_info = q[0], q[1], q[2], q[3], q[4]
-
-                    if q_type == 8:
-                        if current_page:
-                            form_data['pages'].append(current_page)
-                        current_page = []
-
-                    rich_text_info = q[-1] if isinstance(q[-1], list) else []
-                    rich_title = rich_text_info[1] if len(rich_text_info) > 1 and rich_text_info[1] else None
-                    rich_desc = rich_text_info[2] if len(rich_text_info) > 2 and rich_text_info[2] else None
-                    
-                    question['text'] = rich_title or q_text_plain or ''
-                    question['description'] = rich_desc or q_desc_plain or ''
-
-
-                    question['image_url'] = q[5][0] if len(q) > 5 and q[5] and q[5][0] else None
-                    
-                    item_container = soup.find('div', {'data-item-id': str(q_id)})
-
-                    if q_type == 8 or q_info is None:
-                        question['type'] = 'Başlık'
-                        current_page.append(question)
-                    else:
-                        entry_id = q_info[0][0]
-                        question['entry_id'] = f'entry.{entry_id}'
-                        question['required'] = bool(q_info[0][2])
-
-                        if q_type == 0: question['type'] = 'Kısa Yanıt'
-                        elif q_type == 1: question['type'] = 'Paragraf'
-                        elif q_type == 2 or q_type == 4:
-                            question['type'] = 'Çoktan Seçmeli' if q_type == 2 else 'Onay Kutuları'
-                            question['options'] = []
-                            question['has_other'] = False
-                            
-                            option_containers = item_container.select('.docssharedWizToggleLabeledContainer') if item_container else []
-
-                            for i, opt in enumerate(q_info[0][1]):
-                                if not opt: continue
-                                if len(opt) > 4 and opt[4]:
-                                    question['has_other'] = True
-                                    continue
-                                
-                                img_url = None
-                                if i < len(option_containers):
-                                    img_tag = option_containers[i].select_one('img.L05vke')
-                                    if img_tag: img_url = img_tag.get('src')
-                                question['options'].append({'text': opt[0], 'image_url': img_url})
-
-                        elif q_type == 3:
-                            question['type'] = 'Açılır Liste'
-                            question['options'] = [opt[0] for opt in q_info[0][1] if opt and opt[0]]
-                        elif q_type == 5:
-                            question['type'] = 'Doğrusal Ölçek'
-                            question['options'] = [opt[0] for opt in q_info[0][1]]
-                            question['labels'] = q_info[0][3] if len(q_info[0]) > 3 and q_info[0][3] else ['', '']
-                        elif q_type == 7: # Matris Soruları
-                            rows_data = q_info
-                            first_row = rows_data[0]
-                            question['type'] = 'Onay Kutusu Tablosu' if len(first_row)>11 and first_row[11] and first_row[11][0] else 'Çoktan Seçmeli Tablo'
-                            question['required'] = any(bool(r[2]) for r in rows_data)
-                            question['cols'] = [c[0] for c in first_row[1]]
-                            question['rows'] = [{'text': r[3][0], 'entry_id': f"entry.{r[0]}"} for r in rows_data]
-                        elif q_type == 9: question['type'] = 'Tarih'
-                        elif q_type == 10: question['type'] = 'Saat'
-                        elif q_type == 18:
-                            question['type'] = 'Derecelendirme'
-                            question['options'] = [str(o[0]) for o in q_info[0][1]]
-                        else: continue
-                        current_page.append(question)
-
-                if current_page:
-                    form_data['pages'].append(current_page)
-                break 
-            except (json.JSONDecodeError, IndexError, TypeError) as e:
-                return {"error": f"Form verisi ayrıştırılırken bir hata oluştu: {e}."}
-    
-    if not form_data['pages'] or not any(form_data['pages']):
+                text = rich_title or q_text_plain or ''
+                q_description = rich_desc or q_desc_plain or ''
+                image_url = q[5][0] if len(q) > 5 and q[5] and q[5][0] else None
+
+                if q_type == 8 or q_info is None:
+                    current_page.append(Question(QuestionKind.HEADER, text, q_description, image_url))
+                    continue
+
+                entry_id = f'entry.{q_info[0][0]}'
+                required = bool(q_info[0][2])
+                options, has_other, labels, cols, rows = (), False, (), (), ()
+
+                if q_type == 0: kind = QuestionKind.SHORT_ANSWER
+                elif q_type == 1: kind = QuestionKind.PARAGRAPH
+                elif q_type == 2 or q_type == 4:
+                    kind = QuestionKind.MULTIPLE_CHOICE if q_type == 2 else QuestionKind.CHECKBOXES
+                    item_images = option_images.get(str(q_id), ())
+                    rich_options = []
+                    for i, opt in enumerate(q_info[0][1]):
+                        if not opt: continue
+                        if len(opt) > 4 and opt[4]:
+                            has_other = True
+                            continue
+                        rich_options.append(Option(opt[0], item_images[i] if i < len(item_images) else None))
+                    options = tuple(rich_options)
+                elif q_type == 3:
+                    kind = QuestionKind.DROPDOWN
+                    options = tuple(opt[0] for opt in q_info[0][1] if opt and opt[0])
+                elif q_type == 5:
+                    kind = QuestionKind.LINEAR_SCALE
+                    options = tuple(opt[0] for opt in q_info[0][1])
+                    labels = tuple(q_info[0][3]) if len(q_info[0]) > 3 and q_info[0][3] else ('', '')
+                elif q_type == 7: # Matris Soruları
+                    rows_data = q_info
+                    first_row = rows_data[0]
+                    kind = QuestionKind.CHECKBOX_GRID if len(first_row) > 11 and first_row[11] and first_row[11][0] \
+                        else QuestionKind.CHOICE_GRID
+                    required = any(bool(r[2]) for r in rows_data)
+                    cols = tuple(c[0] for c in first_row[1])
+                elif q_type == 9: kind = QuestionKind.DATE
+                elif q_type == 10: kind = QuestionKind.TIME
+                elif q_type == 18:
+                    kind = QuestionKind.RATING
+                    options = tuple(str(o[0]) for o in q_info[0][1])
+                else: continue
+
+                # Düz metin etiketler (Excel sütun başlıkları) analiz sırasında bir kez hesaplanır
+                label = question_label(text, kind)
+                if kind in GRID_KINDS:
+                    rows = tuple(GridRow(r[3][0], f"entry.{r[0]}", f"{label} [{r[3][0]}]") for r in rows_data)
+                current_page.append(Question(kind, text, q_description, image_url, entry_id, required, label,
+                                             options, has_other, labels, cols, rows))
+
+            if current_page:
+                pages.append(tuple(current_page))
+            record_stage('json_walk', time.perf_counter() - walk_started)
+        except (json.JSONDecodeError, IndexError, TypeError) as e:
+            return {"error": f"Form verisi ayrıştırılırken bir hata oluştu: {e}."}
+
+    if not pages or not any(pages):
         return {"error": "Formda analiz edilecek soru bulunamadı veya form yapısı okunamadı."}
-    return {"form_data": form_data}
+    return {"form_data": FormStructure(None, title, description, tuple(pages), response_url)}
+
+
+# --- Değişiklik Tespiti ve Sürüm Geçmişi ---
+# Ayrıştırmanın girdileri (FB_PUBLIC_LOAD_DATA_ metni, açıklama bölgesi ve seçenek görsellerinin
+# dizilişi) özetlenir. Özet daha önce görülmüşse kayıtlı yapı kullanılır, sayfa yeniden ayrıştırılmaz.
+# Özetin her değişimi formun yapı geçmişinde yeni bir sürüm olarak saklanır. Geçmiş isteğe bağlıdır;
+# okuma/yazma hataları analizi durdurmaz, loglanıp formklon_store_errors_total{store="history"} ile sayılır.
+FORM_HISTORY = os.environ.get("FORM_HISTORY", "1") != "0"
+FORM_HISTORY_DB_PATH = os.environ.get(
+    "FORM_HISTORY_DB_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'form_history.sqlite3'))
+FORM_HISTORY_MAX_VERSIONS = int(os.environ.get("FORM_HISTORY_MAX_VERSIONS", 20))
+# Aynı girdiden farklı çıktı üreten ayrıştırıcı değişikliklerinde artırın; eski özetler geçersiz olur.
+PARSE_REVISION = 1
+DESCRIPTION_CLASS_RE = re.compile(r'class="[^"]*\bcBGGJ\b')
+ITEM_LAYOUT_RE = re.compile(r'data-item-id="[^"]*"|docssharedWizToggleLabeledContainer|<img[^>]*\bL05vke\b[^>]*>')
+
+
+def form_fingerprint(html: str):
+    """
+    parse_google_form_html()'in okuduğu parçaların özeti; FB_PUBLIC_LOAD_DATA_ yoksa None.
+    Açıklama için 'cBGGJ' kapsayıcısından ilk soru kapsayıcısına kadar olan bölge alınır;
+    seçenek görselleri kapsayıcı/seçenek işaretleriyle birlikte sırayla özetlenir.
+    """
+    match = FB_LOAD_DATA_RE.search(html)
+    if not match:
+        return None
+    end = html.find('</script>', match.end())
+    digest = hashlib.sha1(f'{FORM_FORMAT_VERSION}.{PARSE_REVISION}\0'.encode('ascii'))
+    digest.update(html[match.end():end if end >= 0 else len(html)].encode('utf-8'))
+    desc = DESCRIPTION_CLASS_RE.search(html)
+    if desc:
+        stop = html.find('data-item-id=', desc.end())
+        digest.update(html[desc.start():stop if stop >= 0 else match.start()].encode('utf-8'))
+    for token in ITEM_LAYOUT_RE.findall(html):
+        digest.update(token.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+class FormHistory:
+    """
+    Form başına yapı geçmişi. form_structures her özetin kodlanmış yapısını tutar (özet tekrar
+    görüldüğünde yapı buradan okunur); form_changes ise gözlenen her değişikliği ayrı bir satır
+    olarak saklar, böylece A -> B -> A gibi geri dönüşler de görünür. Aynı özet art arda görüldükçe
+    yalnızca son satırın last_seen değeri güncellenir. Form başına en fazla max_versions değişiklik tutulur.
+    """
+
+    def __init__(self, path: str, max_versions: int):
+        self.path = path
+        self.max_versions = max_versions
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        conn = sqlite3.connect(path, timeout=10, isolation_level=None)
+        try:
+            conn.execute("DROP TABLE IF EXISTS form_versions")  # özet başına tek satırlık eski düzen
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS form_structures ("
+                "form_id TEXT NOT NULL, fingerprint TEXT NOT NULL, structure BLOB NOT NULL, "
+                "PRIMARY KEY (form_id, fingerprint))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS form_changes ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, form_id TEXT NOT NULL, fingerprint TEXT NOT NULL, "
+                "first_seen REAL NOT NULL, last_seen REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS form_changes_form ON form_changes (form_id, id)")
+        finally:
+            conn.close()
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def lookup(self, form_id: str, fingerprint: str):
+        """Özete karşılık gelen kayıtlı yapı; yoksa veya okunamıyorsa None. Bulunursa gözlem kaydedilir."""
+        conn = self._conn()
+        row = conn.execute("SELECT structure FROM form_structures WHERE form_id = ? AND fingerprint = ?",
+                           (form_id, fingerprint)).fetchone()
+        form = decode_form(row[0]) if row else None
+        if form is not None:
+            self._observe(conn, form_id, fingerprint)
+        return form
+
+    def record(self, form_id: str, fingerprint: str, form):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO form_structures (form_id, fingerprint, structure) VALUES (?, ?, ?)",
+                (form_id, fingerprint, encode_form(form)),
+            )
+            self._observe(conn, form_id, fingerprint, in_transaction=True)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _observe(self, conn, form_id: str, fingerprint: str, in_transaction: bool = False):
+        """
+        Özet formun son değişikliğiyle aynıysa last_seen'i (sık yenilenen formlarda her istekte yazmamak
+        için dakikada bir) günceller; farklıysa yeni bir değişiklik satırı ekler ve eskileri budar.
+        """
+        now = time.time()
+        latest = conn.execute("SELECT id, fingerprint, last_seen FROM form_changes WHERE form_id = ? "
+                              "ORDER BY id DESC LIMIT 1", (form_id,)).fetchone()
+        if latest and latest[1] == fingerprint:
+            if latest[2] < now - 60:
+                conn.execute("UPDATE form_changes SET last_seen = ? WHERE id = ?", (now, latest[0]))
+            return
+        if not in_transaction:
+            conn.execute("BEGIN IMMEDIATE")
+        try:
+            latest = conn.execute("SELECT fingerprint FROM form_changes WHERE form_id = ? ORDER BY id DESC LIMIT 1",
+                                  (form_id,)).fetchone()
+            if not latest or latest[0] != fingerprint:  # başka bir süreç aynı değişikliği yazmamışsa
+                conn.execute("INSERT INTO form_changes (form_id, fingerprint, first_seen, last_seen) VALUES (?, ?, ?, ?)",
+                             (form_id, fingerprint, now, now))
+                conn.execute(
+                    "DELETE FROM form_changes WHERE form_id = ? AND id NOT IN ("
+                    "SELECT id FROM form_changes WHERE form_id = ? ORDER BY id DESC LIMIT ?)",
+                    (form_id, form_id, self.max_versions),
+                )
+                conn.execute(
+                    "DELETE FROM form_structures WHERE form_id = ? AND fingerprint NOT IN ("
+                    "SELECT fingerprint FROM form_changes WHERE form_id = ?)",
+                    (form_id, form_id),
+                )
+            if not in_transaction:
+                conn.execute("COMMIT")
+        except Exception:
+            if not in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+
+    def versions(self, form_id: str):
+        """
+        [(özet, ilk görülme, son görülme, soru sayısı), ...] eskiden yeniye, gözlenen her değişiklik için
+        bir kayıt. Sayfa değişip yapı değişmediyse (ör. yalnızca işaretleme farkı) ardışık aynı yapılar
+        tek sürümde birleştirilir.
+        """
+        rows = self._conn().execute(
+            "SELECT c.fingerprint, c.first_seen, c.last_seen, s.structure FROM form_changes c "
+            "JOIN form_structures s ON s.form_id = c.form_id AND s.fingerprint = c.fingerprint "
+            "WHERE c.form_id = ? ORDER BY c.id", (form_id,)).fetchall()
+        result, previous = [], None
+        for fingerprint, first_seen, last_seen, structure in rows:
+            if structure == previous:
+                fingerprint_, first_seen_, last_seen_, questions = result[-1]
+                result[-1] = (fingerprint_, first_seen_, max(last_seen_, last_seen), questions)
+                continue
+            form = decode_form(structure)
+            result.append((fingerprint, first_seen, last_seen, len(form.columns) if form else None))
+            previous = structure
+        return result
+
+
+form_history = FormHistory(FORM_HISTORY_DB_PATH, FORM_HISTORY_MAX_VERSIONS) if FORM_HISTORY else None
+
+
+# --- Düz Metin Etiketler ---
+class _TextExtractor(HTMLParser):
+    """Zengin metinden, BeautifulSoup'un get_text(separator=" ", strip=True) çıktısıyla aynı düz metni toplar."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ('script', 'style'):
+            self._skip += 1
+
+    def handle_endtag(self, tag):
+        if tag in ('script', 'style') and self._skip:
+            self._skip -= 1
+
+    def handle_data(self, data):
+        if not self._skip:
+            data = data.strip()
+            if data:
+                self.parts.append(data)
+
+
+@lru_cache(maxsize=4096)
+def html_to_text(fragment: str) -> str:
+    """Soru başlıkları gibi kısa HTML parçalarını düz metne çevirir; sonuçlar önbellekte tutulur."""
+    if '<' not in fragment and '&' not in fragment:
+        return fragment.strip()
+    extractor = _TextExtractor()
+    extractor.feed(fragment)
+    extractor.close()
+    return ' '.join(extractor.parts)
+
+
+def question_label(text: str, kind) -> str:
+    """Excel'deki "Soru" sütununda kullanılacak düz metin başlık."""
+    return html_to_text(text or '') or f"İsimsiz Soru ({kind})"
+
+
+# --- Cevapların Dışa Aktarımı ---
+XLSX_MIMETYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+# Bu boyuta kadar olan dosyalar bellekte, daha büyükleri geçici dosyada tutulur
+EXPORT_SPOOL_MAX_SIZE = int(os.environ.get("EXPORT_SPOOL_MAX_SIZE", 1024 * 1024))
+
+
+NOT_ANSWERED = "Yanıtlanmadı"
+# Bu karakterlerle başlayan hücreleri Excel/LibreOffice formül olarak çalıştırabilir (CSV/formül enjeksiyonu)
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def is_formula_like(value) -> bool:
+    return isinstance(value, str) and value.startswith(FORMULA_PREFIXES)
+
+
+def csv_safe(value):
+    """Formül gibi başlayan metinlerin önüne ' eklenir; tablo programı onları düz metin olarak açar."""
+    return "'" + value if is_formula_like(value) else value
+
+
+def _other_answer(user_answers, entry: str) -> str:
+    other_txt = user_answers.get(f"{entry}.other_option_response", "").strip()
+    return f"Diğer: {other_txt}" if other_txt else "Diğer"
+
+
+def _answer_checkboxes(user_answers, entry: str) -> str:
+    answers = user_answers.getlist(entry)
+    final = []
+    if "__other_option__" in answers:
+        answers.remove("__other_option__")
+        final.append(_other_answer(user_answers, entry))
+    final.extend(answers)
+    return ', '.join(final) if final else NOT_ANSWERED
+
+
+def _answer_multiple_choice(user_answers, entry: str) -> str:
+    ans = user_answers.get(entry)
+    if ans == "__other_option__":
+        return _other_answer(user_answers, entry)
+    return ans or NOT_ANSWERED
+
+
+def _answer_checkbox_grid_row(user_answers, entry: str) -> str:
+    return ', '.join(user_answers.getlist(entry)) or NOT_ANSWERED
+
+
+def _answer_choice_grid_row(user_answers, entry: str) -> str:
+    return user_answers.get(entry, NOT_ANSWERED)
+
+
+def _answer_text(user_answers, entry: str) -> str:
+    return user_answers.get(entry, "") or NOT_ANSWERED
+
+
+# Soru tipinden cevap çıkarıcıya eşleme; listede olmayan tipler tek değerli metin olarak okunur
+ANSWER_EXTRACTORS = {
+    QuestionKind.CHECKBOXES: _answer_checkboxes,
+    QuestionKind.MULTIPLE_CHOICE: _answer_multiple_choice,
+    QuestionKind.CHECKBOX_GRID: _answer_checkbox_grid_row,
+    QuestionKind.CHOICE_GRID: _answer_choice_grid_row,
+}
+
+
+def iter_answer_rows(form_structure, user_answers):
+    """
+    Form yapısındaki her soru (tablolarda her satır) için (sütun_anahtarı, soru, cevap) üçlülerini sırayla üretir.
+    Sütun anahtarı sorunun, tablolarda ise satırın entry kimliğidir.
+    Sütunlar ve etiketler analiz sırasında hesaplanmıştır; burada tip başına yalnızca sözlük okumaları yapılır.
+    """
+    for entry, label, kind in form_structure.columns:
+        yield entry, label, ANSWER_EXTRACTORS.get(kind, _answer_text)(user_answers, entry)
+
+
+def write_xlsx(headers, make_rows, sheet_name: str, max_width: int = 70):
+    """
+    Satırları openpyxl'in write-only modunda akış halinde yazar; hiçbir zaman tüm tablo bellekte tutulmaz.
+    make_rows her çağrıldığında satırları baştan üreten bir fonksiyondur: ilk geçişte yalnızca
+    sütun genişlikleri hesaplanır (xlsx'te genişlikler satırlardan önce yazılmak zorundadır),
+    ikinci geçişte satırlar dosyaya aktarılır.
+    Dönüş: başa sarılmış bir SpooledTemporaryFile.
+    """
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+    from openpyxl.utils import get_column_letter
+
+    def text_cell(value):
+        # Yanıtlayanın yazdığı '=...' gibi değerler formül olarak değil, metin olarak saklanır
+        if not is_formula_like(value):
+            return value
+        cell = WriteOnlyCell(ws, value=value)
+        cell.data_type = 's'
+        return cell
+
+    widths = [len(str(h)) for h in headers]
+    for row in make_rows():
+        for i, value in enumerate(row):
+            length = len(str(value))
+            if length > widths[i]:
+                widths[i] = length
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(sheet_name)
+    for i, width in enumerate(widths):
+        ws.column_dimensions[get_column_letter(i + 1)].width = min(width + 2, max_width)
+
+    header_cells = []
+    for h in headers:
+        cell = WriteOnlyCell(ws, value=h)
+        cell.data_type = 's'
+        cell.font = Font(bold=True)
+        header_cells.append(cell)
+    ws.append(header_cells)
+    for row in make_rows():
+        ws.append([text_cell(value) for value in row])
+
+    output = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_MAX_SIZE)
+    wb.save(output)
+    output.seek(0)
+    return output
+
+
+# --- Yanıt Arşivi ---
+# RESPONSE_COLLECTION: gönderilen her yanıt form kimliğine göre kalıcı olarak saklanır ('0' ile kapatılır)
+RESPONSE_COLLECTION = os.environ.get("RESPONSE_COLLECTION", "1") != "0"
+RESPONSES_DB_PATH = os.environ.get(
+    "RESPONSES_DB_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'responses.sqlite3'))
+# Toplu dışa aktarma yalnızca bu anahtarla yapılabilir; tanımlı değilse kapalıdır
+EXPORT_TOKEN = os.environ.get("EXPORT_TOKEN", "")
+EXPORT_CHUNK_SIZE = int(os.environ.get("EXPORT_CHUNK_SIZE", 1000))
+SUBMITTED_AT_LABEL = 'Gönderim Zamanı'
+
+
+class ResponseStore:
+    """
+    Yanıtları form kimliğine göre SQLite'ta biriktirir.
+    Her form için "soru/tablo satırı başına bir sütun" düzeni saklanır; form sonradan
+    değişirse yeni sütunlar sona eklenir, eski yanıtların sütunları korunur.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        conn = sqlite3.connect(path, timeout=10, isolation_level=None)
+        try:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS response_forms ("
+                "form_id TEXT PRIMARY KEY, title TEXT, columns TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, form_id TEXT NOT NULL, "
+                "submitted_at TEXT NOT NULL, answers TEXT NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_form ON responses (form_id, id)")
+        finally:
+            conn.close()
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def append(self, form_structure, answer_rows):
+        """answer_rows: iter_answer_rows() çıktısı. Sütun düzenini günceller ve yanıtı ekler."""
+        form_id = form_structure.form_id
+        columns, answers = [], {}
+        for key, label, answer in answer_rows:
+            columns.append([key, label])
+            answers[key] = answer
+
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT columns FROM response_forms WHERE form_id = ?", (form_id,)).fetchone()
+            known = json.loads(row[0]) if row else []
+            known_keys = {key for key, _ in known}
+            new_columns = [col for col in columns if col[0] not in known_keys]
+            if new_columns or not row:
+                conn.execute(
+                    "INSERT OR REPLACE INTO response_forms (form_id, title, columns, updated_at) VALUES (?, ?, ?, ?)",
+                    (form_id, form_structure.title, json.dumps(known + new_columns, ensure_ascii=False),
+                     time.time()),
+                )
+            conn.execute(
+                "INSERT INTO responses (form_id, submitted_at, answers) VALUES (?, ?, ?)",
+                (form_id, datetime.now().isoformat(timespec='seconds'), json.dumps(answers, ensure_ascii=False)),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def columns(self, form_id: str):
+        """[(anahtar, başlık), ...] listesi; form hiç yanıt almadıysa None."""
+        row = self._conn().execute("SELECT columns FROM response_forms WHERE form_id = ?", (form_id,)).fetchone()
+        return [tuple(col) for col in json.loads(row[0])] if row else None
+
+    def iter_rows(self, form_id: str, columns, chunk_size: int = EXPORT_CHUNK_SIZE):
+        """Yanıtları gönderim sırasıyla, sütun düzenine göre liste olarak üretir; her seferinde tek parça okunur."""
+        conn = self._conn()
+        last_id = 0
+        while True:
+            chunk = conn.execute(
+                "SELECT id, submitted_at, answers FROM responses WHERE form_id = ? AND id > ? ORDER BY id LIMIT ?",
+                (form_id, last_id, chunk_size),
+            ).fetchall()
+            if not chunk:
+                return
+            for last_id, submitted_at, raw in chunk:
+                answers = json.loads(raw)
+                yield [submitted_at] + [answers.get(key, '') for key, _ in columns]
+
+
+response_store = ResponseStore(RESPONSES_DB_PATH) if RESPONSE_COLLECTION else None
+
+
+def export_headers(columns):
+    """Sütun başlıklarını üretir; aynı metne sahip sorular '(2)', '(3)' ekiyle ayrıştırılır."""
+    headers, seen = [SUBMITTED_AT_LABEL], {SUBMITTED_AT_LABEL: 1}
+    for _, label in columns:
+        count = seen.get(label, 0) + 1
+        seen[label] = count
+        headers.append(label if count == 1 else f"{label} ({count})")
+    return headers
+
+
+def iter_csv_chunks(headers, rows, chunk_size: int = EXPORT_CHUNK_SIZE):
+    """
+    CSV'yi parça parça üretir; Excel'in UTF-8'i tanıması için BOM ile başlar.
+    Formül gibi başlayan hücreler csv_safe() ile etkisizleştirilir.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write('\ufeff')
+    writer.writerow([csv_safe(h) for h in headers])
+    for i, row in enumerate(rows, 1):
+        writer.writerow([csv_safe(value) for value in row])
+        if i % chunk_size == 0:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode('utf-8')
+
+
+def write_parquet(headers, rows, chunk_size: int = EXPORT_CHUNK_SIZE):
+    """Satırları pyarrow ile parça parça (row group) Parquet'e yazar. pyarrow isteğe bağlıdır."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([(h, pa.string()) for h in headers])
+    output = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_MAX_SIZE)
+    with pq.ParquetWriter(output, schema) as writer:
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= chunk_size:
+                writer.write_table(pa.Table.from_pylist([dict(zip(headers, r)) for r in batch], schema=schema))
+                batch = []
+        if batch:
+            writer.write_table(pa.Table.from_pylist([dict(zip(headers, r)) for r in batch], schema=schema))
+    output.seek(0)
+    return output
+
+
+# --- Google'a Yanıt İletme ---
+# FORWARD_RESPONSES: gönderilen yanıtlar asıl Google Formu'na (formResponse) da iletilir ('0' ile kapatılır).
+# İletim diskteki bir iş kuyruğu üzerinden arka planda yapılır; kullanıcı Google'ın yanıtını beklemez.
+FORWARD_RESPONSES = os.environ.get("FORWARD_RESPONSES", "1") != "0"
+FORWARD_DB_PATH = os.environ.get(
+    "FORWARD_DB_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'forward.sqlite3'))
+FORWARD_WORKERS = int(os.environ.get("FORWARD_WORKERS", 4))
+# Aynı forma saniyede en fazla bu kadar yanıt iletilir (tüm worker'lar için ortak); 0 sınırsız
+FORWARD_RATE_PER_FORM = float(os.environ.get("FORWARD_RATE_PER_FORM", 2))
+FORWARD_MAX_ATTEMPTS = int(os.environ.get("FORWARD_MAX_ATTEMPTS", 8))
+FORWARD_BACKOFF_BASE = float(os.environ.get("FORWARD_BACKOFF_BASE", 5))
+FORWARD_BACKOFF_MAX = float(os.environ.get("FORWARD_BACKOFF_MAX", 900))
+FORWARD_LEASE_SECONDS = 120
+FORWARD_IDLE_POLL = 5
+# İletim sonucu yazılamazsa kira bitiminden bu kadar saniye öncesine kadar yeniden denenir
+FORWARD_SETTLE_MARGIN = 5
+# Aynı form anahtarıyla (çift tıklama, eski çerezin tekrar gönderilmesi) gelen gönderimler bir kez iletilir;
+# anahtar en fazla yapının saklandığı süre kadar geçerli olduğundan kayıtlar o kadar tutulur.
+FORWARD_DEDUPE_SECONDS = STRUCTURE_STORE_TTL
+
+metrics.describe('formklon_forward_total', 'counter', "Google'a yanıt iletimleri (result: ok|retry|dead|duplicate).")
+
+
+def form_response_payload(form, user_answers) -> str:
+    """
+    Cevapları formResponse'un beklediği alanlara çevirir. Yalnızca formda bilinen entry alanları
+    ('Diğer' metni dahil) alınır; tarih ve saat Google'ın _year/_month/_day ve _hour/_minute alanlarına bölünür.
+    """
+    fields = []
+    for entry, _, kind in form.columns:
+        values = [v for v in user_answers.getlist(entry) if v]
+        if not values:
+            continue
+        if kind is QuestionKind.DATE:
+            year, _, rest = values[0].partition('-')
+            month, _, day = rest.partition('-')
+            fields += [(f'{entry}_year', year), (f'{entry}_month', month), (f'{entry}_day', day)]
+        elif kind is QuestionKind.TIME:
+            hour, _, minute = values[0].partition(':')
+            fields += [(f'{entry}_hour', hour), (f'{entry}_minute', minute)]
+        else:
+            fields.extend((entry, value) for value in values)
+            if '__other_option__' in values:
+                fields.append((f'{entry}.other_option_response', user_answers.get(f'{entry}.other_option_response', '')))
+    fields.append(('fvv', '1'))
+    if len(form.pages) > 1:
+        fields.append(('pageHistory', ','.join(str(i) for i in range(len(form.pages)))))
+    return urlencode(fields)
+
+
+class ForwardQueue:
+    """
+    Google'a iletilecek yanıtlar için SQLite tabanlı kalıcı iş kuyruğu; tüm worker süreçleri aynı dosyayı
+    paylaşır. Bir iş BEGIN IMMEDIATE içinde kiralanır (locked_until); kiralayan süreç çökerse kira
+    dolunca başka bir thread alır. Form başına hız sınırı aynı işlemde forward_rate tablosundan uygulanır.
+    Geçici hatalar (bağlantı, 429, 5xx) üstel geri çekilmeyle yeniden denenir; kalıcı hatalar ve
+    deneme sınırını aşan işler forward_dead_letters tablosuna taşınır. forward_claims tablosu her
+    gönderim anahtarının yalnızca bir kez kuyruğa alınmasını sağlar.
+    """
+
+    def __init__(self, path: str, workers: int, rate_per_form: float, max_attempts: int):
+        self.path = path
+        self.workers = workers
+        self.rate_per_form = rate_per_form
+        self.max_attempts = max_attempts
+        self._local = threading.local()
+        self._wake = threading.Event()
+        self._threads = []
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        conn = sqlite3.connect(path, timeout=10, isolation_level=None)
+        try:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS forward_jobs ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, form_id TEXT NOT NULL, url TEXT NOT NULL, body TEXT NOT NULL, "
+                "attempts INTEGER NOT NULL, next_attempt_at REAL NOT NULL, locked_until REAL NOT NULL, "
+                "last_error TEXT, created_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS forward_jobs_due ON forward_jobs (next_attempt_at)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS forward_rate (form_id TEXT PRIMARY KEY, next_allowed_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS forward_dead_letters ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, form_id TEXT NOT NULL, url TEXT NOT NULL, body TEXT NOT NULL, "
+                "attempts INTEGER NOT NULL, last_error TEXT, created_at REAL NOT NULL, failed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS forward_claims (dedupe_key TEXT PRIMARY KEY, created_at REAL NOT NULL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS forward_claims_created ON forward_claims (created_at)")
+        finally:
+            conn.close()
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def enqueue(self, form_id: str, url: str, body: str, dedupe_key: str = None) -> bool:
+        """
+        İşi kuyruğa ekler. dedupe_key daha önce kuyruğa alınmışsa hiçbir şey yapmaz ve False döndürür;
+        anahtarın sahiplenilmesi ve işin eklenmesi tek işlemde yapılır.
+        """
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if dedupe_key is not None:
+                conn.execute("DELETE FROM forward_claims WHERE created_at < ?", (now - FORWARD_DEDUPE_SECONDS,))
+                claimed = conn.execute("INSERT OR IGNORE INTO forward_claims (dedupe_key, created_at) VALUES (?, ?)",
+                                       (dedupe_key, now)).rowcount
+                if not claimed:
+                    conn.execute("COMMIT")
+                    metrics.inc('formklon_forward_total', (('result', 'duplicate'),))
+                    return False
+            conn.execute(
+                "INSERT INTO forward_jobs (form_id, url, body, attempts, next_attempt_at, locked_until, created_at) "
+                "VALUES (?, ?, ?, 0, ?, 0, ?)",
+                (form_id, url, body, now, now),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        self.start()
+        self._wake.set()
+        return True
+
+    def start(self):
+        """İletim thread'lerini (bir kez) başlatır; fork öncesinde çağrılmamalıdır."""
+        if self._threads:
+            return
+        with self._lock:
+            if self._threads:
+                return
+            for n in range(self.workers):
+                thread = threading.Thread(target=self._worker, name=f'formklon-forward-{n}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def claim(self):
+        """
+        Sırası gelmiş ve formu hız sınırına takılmayan bir işi kiralar.
+        Dönüş: (iş, None) veya iş yoksa (None, bir sonraki işe kadar beklenecek süre).
+        """
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            job = conn.execute(
+                "SELECT j.id, j.form_id, j.url, j.body, j.attempts FROM forward_jobs j "
+                "LEFT JOIN forward_rate r ON r.form_id = j.form_id "
+                "WHERE j.next_attempt_at <= ? AND j.locked_until <= ? AND COALESCE(r.next_allowed_at, 0) <= ? "
+                "ORDER BY j.next_attempt_at LIMIT 1",
+                (now, now, now),
+            ).fetchone()
+            wait = None
+            if job:
+                conn.execute("UPDATE forward_jobs SET locked_until = ? WHERE id = ?",
+                             (now + FORWARD_LEASE_SECONDS, job[0]))
+                if self.rate_per_form > 0:
+                    conn.execute("INSERT OR REPLACE INTO forward_rate (form_id, next_allowed_at) VALUES (?, ?)",
+                                 (job[1], now + 1 / self.rate_per_form))
+            else:
+                next_at = conn.execute(
+                    "SELECT MIN(MAX(j.next_attempt_at, j.locked_until, COALESCE(r.next_allowed_at, 0))) "
+                    "FROM forward_jobs j LEFT JOIN forward_rate r ON r.form_id = j.form_id"
+                ).fetchone()[0]
+                wait = FORWARD_IDLE_POLL if next_at is None else min(FORWARD_IDLE_POLL, max(0.01, next_at - now))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return job, wait
+
+    def _worker(self):
+        while True:
+            try:
+                job, wait = self.claim()
+            except sqlite3.Error:
+                job, wait = None, FORWARD_IDLE_POLL  # veritabanı geçici olarak kilitli
+            if job is None:
+                if self._wake.wait(wait):
+                    self._wake.clear()
+                continue
+            try:
+                self.deliver(job)
+            except Exception:  # thread durmasın; iş kira dolunca tekrar alınır
+                logger.exception("Yanıt iletimi kaydedilemedi (iş %s)", job[0])
+
+    def deliver(self, job):
+        """
+        İşi Google'a gönderir ve sonucu kaydeder. Gönderim kodundaki beklenmedik bir hata da bir deneme
+        sayılır; böylece iş sonsuza dek dönmez, deneme sınırında ölü mektuplara düşer.
+        """
+        import requests
+
+        job_id, form_id, url, body, attempts = job
+        lease_end = time.time() + FORWARD_LEASE_SECONDS
+        try:
+            with span('forward'):
+                resp = upstream_request(
+                    'POST', url, data=body.encode('utf-8'), allow_redirects=False, timeout=20,
+                    headers={'Content-Type': 'application/x-www-form-urlencoded'},
+                )
+            resp.close()
+            error = None if 200 <= resp.status_code < 300 else f"HTTP {resp.status_code}"
+            retryable = resp.status_code == 429 or resp.status_code >= 500
+        except (requests.RequestException, UpstreamBusy) as e:
+            error, retryable = str(e) or type(e).__name__, True
+        except Exception as e:
+            logger.exception("Yanıt iletimi beklenmedik hatayla kesildi (iş %s)", job_id)
+            error, retryable = f"{type(e).__name__}: {e}", True
+        self.settle(job_id, attempts + 1, error, retryable, lease_end)
+
+    def settle(self, job_id: int, attempts: int, error, retryable: bool, lease_end: float):
+        """
+        İletim sonucunu kuyruğa yazar. Veritabanı hatasında yalnızca bu kayıt, kira bitmeden önce
+        yeniden denenir; POST tekrar gönderilmez. Kira içinde yazılamazsa iş başka bir thread'e
+        düşer ve (başarılı gönderimse) Google'a bir kez daha gidebilir; bu durum loglanır.
+        """
+        delay = 0.1
+        while True:
+            try:
+                self._record(job_id, attempts, error, retryable)
+                return
+            except sqlite3.Error:
+                if time.time() + delay >= lease_end - FORWARD_SETTLE_MARGIN:
+                    logger.exception("İletim sonucu kira süresi içinde kaydedilemedi (iş %s, hata %s)", job_id, error)
+                    return
+                logger.warning("İletim sonucu kaydedilemedi, yeniden denenecek (iş %s)", job_id, exc_info=True)
+                time.sleep(delay)
+                delay = min(delay * 2, FORWARD_SETTLE_MARGIN)
+
+    def _record(self, job_id: int, attempts: int, error, retryable: bool):
+        conn = self._conn()
+        if error is None:
+            conn.execute("DELETE FROM forward_jobs WHERE id = ?", (job_id,))
+            metrics.inc('formklon_forward_total', (('result', 'ok'),))
+        elif retryable and attempts < self.max_attempts:
+            delay = min(FORWARD_BACKOFF_MAX, FORWARD_BACKOFF_BASE * 2 ** (attempts - 1))
+            conn.execute(
+                "UPDATE forward_jobs SET attempts = ?, next_attempt_at = ?, locked_until = 0, last_error = ? "
+                "WHERE id = ?",
+                (attempts, time.time() + random.uniform(delay / 2, delay), error, job_id),
+            )
+            metrics.inc('formklon_forward_total', (('result', 'retry'),))
+        else:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "INSERT INTO forward_dead_letters (form_id, url, body, attempts, last_error, created_at, failed_at) "
+                    "SELECT form_id, url, body, ?, ?, created_at, ? FROM forward_jobs WHERE id = ?",
+                    (attempts, error, time.time(), job_id),
+                )
+                conn.execute("DELETE FROM forward_jobs WHERE id = ?", (job_id,))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            metrics.inc('formklon_forward_total', (('result', 'dead'),))
+
+    def counts(self):
+        """(bekleyen iş sayısı, ölü mektup sayısı)"""
+        conn = self._conn()
+        return (conn.execute("SELECT COUNT(*) FROM forward_jobs").fetchone()[0],
+                conn.execute("SELECT COUNT(*) FROM forward_dead_letters").fetchone()[0])
+
+    def requeue_dead(self, form_id: str = None) -> int:
+        """Ölü mektupları (isteğe bağlı olarak tek bir form için) deneme sayısı sıfırlanmış olarak kuyruğa geri alır."""
+        where, params = ("WHERE form_id = ?", (form_id,)) if form_id else ("", ())
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            moved = conn.execute(
+                "INSERT INTO forward_jobs (form_id, url, body, attempts, next_attempt_at, locked_until, last_error, created_at) "
+                f"SELECT form_id, url, body, 0, ?, 0, last_error, created_at FROM forward_dead_letters {where}",
+                (now,) + params,
+            ).rowcount
+            conn.execute(f"DELETE FROM forward_dead_letters {where}", params)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return moved
+
+
+forward_queue = ForwardQueue(FORWARD_DB_PATH, FORWARD_WORKERS, FORWARD_RATE_PER_FORM, FORWARD_MAX_ATTEMPTS) \
+    if FORWARD_RESPONSES else None
+
+
+# --- Soru Makroları ---
+# Her soru tipi ayrı bir makrodur; şablonlar uygulama ömrü boyunca bir kez derlenir.
+QUESTION_MACROS = """
+{% macro required_attr(q) %}{% if q.required %}required{% endif %}{% endmacro %}
+
+{% macro option_label(q, opt, input_type) -%}
+<label><input type="{{ input_type }}" name="{{ q.entry_id }}" value="{{ opt.text }}" {{ required_attr(q) }}><div class="option-content"><span class="option-text">{{ opt.text | safe }}</span>{% if opt.image_url %}<div class="option-image-container"><img src="{{ opt.image_url | proxied_image('o') }}" alt="{{ opt.text }}" loading="lazy" decoding="async"></div>{% endif %}</div></label>
+{%- endmacro %}
+
+{% macro other_option(q, input_type) -%}
+<label class="other-option-label"><input type="{{ input_type }}" name="{{ q.entry_id }}" value="__other_option__"><span>Diğer:</span><input type="text" class="other-option-input" name="{{ q.entry_id }}.other_option_response"></label>
+{%- endmacro %}
+
+{% macro section_header(q) %}
+<div class="title-description-block">
+    <div class="section-title">{{ q.text | safe }}</div>
+    {% if q.description %}<div class="section-description">{{ q.description | safe }}</div>{% endif %}
+    {% if q.image_url %}<div class="form-image-container"><img src="{{ q.image_url | proxied_image('q') }}" alt="Başlık Görseli" loading="lazy" decoding="async"></div>{% endif %}
+</div>
+{% endmacro %}
+
+{% macro email(q) %}<input type="email" name="{{ q.entry_id }}" required>{% endmacro %}
+
+{% macro short_answer(q) %}<input type="text" name="{{ q.entry_id }}" {{ required_attr(q) }}>{% endmacro %}
+
+{% macro paragraph(q) %}<textarea name="{{ q.entry_id }}" {{ required_attr(q) }}></textarea>{% endmacro %}
+
+{% macro choice_group(q, group_class, input_type) %}
+<div class="{{ group_class }}">
+    {% for opt in q.options %}{{ option_label(q, opt, input_type) }}{% endfor %}
+    {% if q.has_other %}{{ other_option(q, input_type) }}{% endif %}
+</div>
+{% endmacro %}
+
+{% macro dropdown(q) %}
+<select name="{{ q.entry_id }}" {{ required_attr(q) }}><option value="" disabled selected>Seçin...</option>{% for opt in q.options %}<option value="{{ opt }}">{{ opt | safe }}</option>{% endfor %}</select>
+{% endmacro %}
+
+{% macro linear_scale(q) %}
+<div class="radio-group" style="flex-direction:row;justify-content:space-around;align-items:center;"><span><b>{{ q.labels[0] | safe }}</b></span>{% for opt in q.options %} <label style="flex-direction:column;align-items:center;"><span>{{ opt | safe }}</span><input type="radio" name="{{ q.entry_id }}" value="{{ opt }}" {{ required_attr(q) }}></label> {% endfor %}<span><b>{{ q.labels[1] | safe }}</b></span></div>
+{% endmacro %}
+
+{% macro rating(q) %}
+<div class="rating-group">{% for opt in q.options | reverse %} <input type="radio" id="star{{ opt }}-{{ q.entry_id }}" name="{{ q.entry_id }}" value="{{ opt }}" {{ required_attr(q) }}><label for="star{{ opt }}-{{ q.entry_id }}">★</label> {% endfor %}</div>
+{% endmacro %}
+
+{% macro date(q) %}<input type="date" name="{{ q.entry_id }}" {{ required_attr(q) }}>{% endmacro %}
+
+{% macro time(q) %}<input type="time" name="{{ q.entry_id }}" {{ required_attr(q) }}>{% endmacro %}
+
+{% macro grid(q, input_type) %}
+<table class="grid-table"><thead><tr><th></th>{% for col in q.cols %}<th>{{ col | safe }}</th>{% endfor %}</tr></thead><tbody>{% for row in q.rows %}<tr><td>{{ row.text | safe }}</td>{% for col in q.cols %}<td><input type="{{ input_type }}" name="{{ row.entry_id }}" value="{{ col }}" {% if q.required and input_type == 'radio' %}required{% endif %}></td>{% endfor %}</tr>{% endfor %}</tbody></table>
+{% endmacro %}
+
+{% macro render_question(q) %}
+{% if q.type == 'Başlık' %}{{ section_header(q) }}{% else %}
+<div class="form-group">
+    <label class="question-label">{{ q.text | safe }} {% if q.required %}<span class="required-star">*</span>{% endif %}</label>
+    {% if q.description %}<div class="question-description">{{ q.description | safe }}</div>{% endif %}
+    {% if q.image_url %}<div class="form-image-container"><img src="{{ q.image_url | proxied_image('q') }}" alt="Soru Görseli" loading="lazy" decoding="async"></div>{% endif %}
+    {% if q.type == 'E-posta' %}{{ email(q) }}
+    {% elif q.type == 'Kısa Yanıt' %}{{ short_answer(q) }}
+    {% elif q.type == 'Paragraf' %}{{ paragraph(q) }}
+    {% elif q.type == 'Çoktan Seçmeli' %}{{ choice_group(q, 'radio-group', 'radio') }}
+    {% elif q.type == 'Onay Kutuları' %}{{ choice_group(q, 'checkbox-group', 'checkbox') }}
+    {% elif q.type == 'Açılır Liste' %}{{ dropdown(q) }}
+    {% elif q.type == 'Doğrusal Ölçek' %}{{ linear_scale(q) }}
+    {% elif q.type == 'Derecelendirme' %}{{ rating(q) }}
+    {% elif q.type == 'Tarih' %}{{ date(q) }}
+    {% elif q.type == 'Saat' %}{{ time(q) }}
+    {% elif q.type == 'Çoktan Seçmeli Tablo' %}{{ grid(q, 'radio') }}
+    {% elif q.type == 'Onay Kutusu Tablosu' %}{{ grid(q, 'checkbox') }}
+    {% endif %}
+</div>
+{% endif %}
+{% endmacro %}
+
+{% macro render_section(page, number, total) %}
+{% if total > 1 %}
+    <div class="page-counter">Bölüm {{ number }} / {{ total }}</div>
+{% endif %}
+{% for q in page %}
+    {{ render_question(q) }}
+{% endfor %}
+{% endmacro %}
+"""
+
+# /form/sections/<n> ile istenen tek bir bölümün HTML parçası
+SECTION_TEMPLATE = """{% import 'questions.html' as questions %}{{ questions.render_section(page, number, total) }}"""
 
 
 # --- HTML Şablonu (JavaScript Kısmı Güncellendi) ---
-HTML_TEMPLATE = """
+HTML_TEMPLATE = """{% import 'questions.html' as questions %}
 <!DOCTYPE html>
 <html lang="tr">
 <head>
@@ -247,56 +2263,15 @@ HTML_TEMPLATE = """
             <div class="main-description" style="text-align:center; margin-bottom: 2rem;">{{ form_data.description | safe }}</div>
         {% endif %}
         <form method="post" action="/submit" id="clone-form">
+            {% if form_token %}<input type="hidden" name="form_token" value="{{ form_token }}">{% endif %}
             {% for page in form_data.pages %}
+            {% if lazy_sections and not loop.first %}
+            <div class="page" id="page-{{ loop.index0 }}" data-src="{{ url_for('formklon.form_section', index=loop.index0, t=form_token) }}" style="display: none;"></div>
+            {% else %}
             <div class="page" id="page-{{ loop.index0 }}" style="display: {% if loop.index0 == 0 %}block{% else %}none{% endif %};">
-                {% if form_data.pages | length > 1 %}
-                    <div class="page-counter">Bölüm {{ loop.index }} / {{ form_data.pages | length }}</div>
-                {% endif %}
-                {% for q in page %}
-                    {% if q.type == 'Başlık' %}
-                    <div class="title-description-block">
-                        <div class="section-title">{{ q.text | safe }}</div>
-                        {% if q.description %}<div class="section-description">{{ q.description | safe }}</div>{% endif %}
-                        {% if q.image_url %}<div class="form-image-container"><img src="{{ q.image_url }}" alt="Başlık Görseli"></div>{% endif %}
-                    </div>
-                    {% else %}
-                    <div class="form-group">
-                        <label class="question-label">{{ q.text | safe }} {% if q.required %}<span class="required-star">*</span>{% endif %}</label>
-                        {% if q.description %}<div class="question-description">{{ q.description | safe }}</div>{% endif %}
-                        {% if q.image_url %}<div class="form-image-container"><img src="{{ q.image_url }}" alt="Soru Görseli"></div>{% endif %}
-
-                        {% if q.type == 'E-posta' %} <input type="email" name="{{ q.entry_id }}" required>
-                        {% elif q.type == 'Kısa Yanıt' %} <input type="text" name="{{ q.entry_id }}" {% if q.required %}required{% endif %}>
-                        {% elif q.type == 'Paragraf' %} <textarea name="{{ q.entry_id }}" {% if q.required %}required{% endif %}></textarea>
-                        {% elif q.type == 'Çoktan Seçmeli' %}
-                        <div class="radio-group">
-                            {% for opt in q.options %}
-                            <label><input type="radio" name="{{ q.entry_id }}" value="{{ opt.text }}" {% if q.required %}required{% endif %}><div class="option-content"><span class="option-text">{{ opt.text | safe }}</span>{% if opt.image_url %}<div class="option-image-container"><img src="{{ opt.image_url }}" alt="{{ opt.text }}"></div>{% endif %}</div></label>
-                            {% endfor %}
-                            {% if q.has_other %} <label class="other-option-label"><input type="radio" name="{{ q.entry_id }}" value="__other_option__"><span>Diğer:</span><input type="text" class="other-option-input" name="{{ q.entry_id }}.other_option_response"></label> {% endif %}
-                        </div>
-                        {% elif q.type == 'Onay Kutuları' %}
-                        <div class="checkbox-group">
-                            {% for opt in q.options %}
-                            <label><input type="checkbox" name="{{ q.entry_id }}" value="{{ opt.text }}" {% if q.required %}required{% endif %}><div class="option-content"><span class="option-text">{{ opt.text | safe }}</span>{% if opt.image_url %}<div class="option-image-container"><img src="{{ opt.image_url }}" alt="{{ opt.text }}"></div>{% endif %}</div></label>
-                            {% endfor %}
-                            {% if q.has_other %} <label class="other-option-label"><input type="checkbox" name="{{ q.entry_id }}" value="__other_option__"><span>Diğer:</span><input type="text" class="other-option-input" name="{{ q.entry_id }}.other_option_response"></label>{% endif %}
-                        </div>
-                        {% elif q.type == 'Açılır Liste' %}
-                        <select name="{{ q.entry_id }}" {% if q.required %}required{% endif %}><option value="" disabled selected>Seçin...</option>{% for opt in q.options %}<option value="{{ opt }}">{{ opt | safe }}</option>{% endfor %}</select>
-                        {% elif q.type == 'Doğrusal Ölçek' %}
-                        <div class="radio-group" style="flex-direction:row;justify-content:space-around;align-items:center;"><span><b>{{ q.labels[0] | safe }}</b></span>{% for opt in q.options %} <label style="flex-direction:column;align-items:center;"><span>{{ opt | safe }}</span><input type="radio" name="{{ q.entry_id }}" value="{{ opt }}" {% if q.required %}required{% endif %}></label> {% endfor %}<span><b>{{ q.labels[1] | safe }}</b></span></div>
-                        {% elif q.type == 'Derecelendirme' %}
-                        <div class="rating-group">{% for opt in q.options | reverse %} <input type="radio" id="star{{ opt }}-{{ q.entry_id }}" name="{{ q.entry_id }}" value="{{ opt }}" {% if q.required %}required{% endif %}><label for="star{{ opt }}-{{ q.entry_id }}">★</label> {% endfor %}</div>
-                        {% elif q.type == 'Tarih' %} <input type="date" name="{{ q.entry_id }}" {% if q.required %}required{% endif %}>
-                        {% elif q.type == 'Saat' %} <input type="time" name="{{ q.entry_id }}" {% if q.required %}required{% endif %}>
-                        {% elif q.type in ['Çoktan Seçmeli Tablo','Onay Kutusu Tablosu'] %}
-                        <table class="grid-table"><thead><tr><th></th>{% for col in q.cols %}<th>{{ col | safe }}</th>{% endfor %}</tr></thead><tbody>{% for row in q.rows %}<tr><td>{{ row.text | safe }}</td>{% for col in q.cols %}<td><input type="{{ 'checkbox' if 'Onay' in q.type else 'radio' }}" name="{{ row.entry_id }}" value="{{ col }}" {% if q.required and 'Onay' not in q.type %}required{% endif %}></td>{% endfor %}</tr>{% endfor %}</tbody></table>
-                        {% endif %}
-                    </div>
-                    {% endif %}
-                {% endfor %}
+                {{ questions.render_section(page, loop.index, form_data.pages | length) }}
             </div>
+            {% endif %}
             {% endfor %}
             <div class="navigation-buttons">
                 <button type="button" class="btn btn-secondary" id="back-button" onclick="navigate(-1)" style="display: none;">Geri</button>
@@ -307,9 +2282,9 @@ HTML_TEMPLATE = """
     {% endif %}
 </div>
 <script>
-document.addEventListener('DOMContentLoaded', () => {
+function bindInputs(root) {
     // DÜZELTME: RADYO BUTONU SEÇİMİNİ KALDIRMA (TÜM SATIRA TIKLAMA)
-    document.querySelectorAll('.radio-group > label').forEach(label => {
+    root.querySelectorAll('.radio-group > label').forEach(label => {
         const radio = label.querySelector('input[type="radio"]');
         if (radio) {
             let wasCheckedOnMouseDown = false;
@@ -330,7 +2305,7 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     });
 
-    document.querySelectorAll('.other-option-input').forEach(textInput => {
+    root.querySelectorAll('.other-option-input').forEach(textInput => {
         const checkAssociatedControl = () => {
             const associatedControl = textInput.closest('label').querySelector('input[type=radio], input[type=checkbox]');
             if (associatedControl) { associatedControl.checked = true; }
@@ -338,13 +2313,38 @@ document.addEventListener('DOMContentLoaded', () => {
         textInput.addEventListener('input', checkAssociatedControl);
         textInput.addEventListener('focus', checkAssociatedControl);
     });
+}
+
+document.addEventListener('DOMContentLoaded', () => {
+    bindInputs(document);
     const pageCount = document.querySelectorAll('.page').length;
-    if(pageCount > 0) { showPage(0); } else { 
+    if(pageCount > 0) { showPage(0); loadSection(1).catch(() => {}); } else { 
         const navButtons = document.querySelector('.navigation-buttons');
         if (navButtons) navButtons.style.display = 'none'; 
     }
 });
 
+// Tembel bölümler (data-src) ilk ihtiyaçta sunucudan alınır; bir sonraki bölüm önceden indirilir.
+const sectionRequests = {};
+function loadSection(index) {
+    const page = pages[index];
+    if (!page || !page.dataset.src) return Promise.resolve();
+    if (!sectionRequests[index]) {
+        sectionRequests[index] = fetch(page.dataset.src, { credentials: 'same-origin' })
+            .then(response => {
+                if (!response.ok) throw new Error(response.status);
+                return response.text();
+            })
+            .then(html => {
+                page.innerHTML = html;
+                delete page.dataset.src;
+                bindInputs(page);
+            })
+            .catch(err => { delete sectionRequests[index]; throw err; });
+    }
+    return sectionRequests[index];
+}
+
 let currentPageIndex = 0;
 const pages = document.querySelectorAll('.page');
 const backButton = document.getElementById('back-button');
@@ -410,8 +2410,11 @@ function navigate(direction) {
     if (direction > 0 && !validatePage(currentPageIndex)) { return; }
     const newIndex = currentPageIndex + direction;
     if (newIndex >= 0 && newIndex < pages.length) {
-        currentPageIndex = newIndex;
-        showPage(currentPageIndex);
+        loadSection(newIndex).then(() => {
+            currentPageIndex = newIndex;
+            showPage(currentPageIndex);
+            loadSection(newIndex + 1).catch(() => {});
+        }).catch(() => alert('Bölüm yüklenemedi, lütfen tekrar deneyin.'));
     }
 }
 </script>
@@ -419,99 +2422,572 @@ function navigate(direction) {
 </html>
 """
 
+# --- Bölüm Bölüm Gösterim ---
+# Bu kadar veya daha fazla bölümü olan formlarda yalnızca ilk bölüm sayfayla birlikte gönderilir;
+# diğerleri gezinirken /form/sections/<n> adresinden alınır. 0 tüm bölümleri tek seferde gönderir.
+LAZY_SECTIONS_MIN_PAGES = int(os.environ.get("LAZY_SECTIONS_MIN_PAGES", 3))
+GZIP_MIN_BYTES = 1024
+FORM_ID_CHARS_RE = re.compile(r'[A-Za-z0-9_-]+')
+
+
+def use_lazy_sections(form) -> bool:
+    return bool(LAZY_SECTIONS_MIN_PAGES) and len(form.pages) >= LAZY_SECTIONS_MIN_PAGES
+
+
+def json_response(payload):
+    """
+    ETag'li, istemci kabul ediyorsa gzip ile sıkıştırılmış JSON yanıtı. Sıkıştırılmış gösterim
+    ayrı bir ETag taşır; koşullu isteklerde (304) sıkıştırma hiç yapılmaz.
+    """
+    body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    use_gzip = len(body) >= GZIP_MIN_BYTES and 'gzip' in request.accept_encodings
+    response = make_response(body)
+    response.mimetype = 'application/json'
+    response.set_etag(hashlib.sha1(body).hexdigest() + ('-gzip' if use_gzip else ''))
+    response.headers['Cache-Control'] = 'no-cache'
+    response.vary.add('Accept-Encoding')
+    response = response.make_conditional(request)
+    if use_gzip and response.status_code == 200:
+        response.set_data(gzip.compress(body, compresslevel=6))
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+
+# --- Toplu Analiz ---
+BATCH_MAX_URLS = int(os.environ.get("BATCH_MAX_URLS", 1000))
+BATCH_WORKERS = int(os.environ.get("BATCH_WORKERS", 16))
+# /api/batch yalnızca bu anahtarla kullanılabilir; tanımlı değilse kapalıdır (CLI komutu etkilenmez)
+BATCH_TOKEN = os.environ.get("BATCH_TOKEN", "")
+
+
+def is_google_form_url(url: str) -> bool:
+    """Adresin sunucusu tam olarak docs.google.com (/forms altında) veya forms.gle olmalıdır."""
+    try:
+        parts = urlsplit(url)
+        host = parts.hostname
+    except ValueError:
+        return False
+    if parts.scheme not in ('https', 'http') or parts.username or parts.password:
+        return False
+    if host == 'docs.google.com':
+        return parts.path.startswith('/forms/')
+    return host == 'forms.gle'
+
+
+def iter_batch_analysis(urls, workers: int = BATCH_WORKERS):
+    """
+    URL'leri sınırlı bir thread havuzunda analiz eder ve her sonucu tamamlandığı sırayla üretir:
+    {"url": ..., "form_data": ...} veya {"url": ..., "error": ...}.
+    Üretici erken kapatılırsa (ör. istemci bağlantıyı keserse) bekleyen işler iptal edilir.
+    """
+    pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='batch')
+    try:
+        futures = {}
+        for url in urls:
+            if is_google_form_url(url):
+                futures[pool.submit(analyze_google_form, url)] = url
+            else:
+                yield {"url": url, "error": "Geçerli bir Google Form URL'si girin."}
+        for future in as_completed(futures):
+            url = futures[future]
+            try:
+                result = future.result()
+                if "form_data" in result:
+                    result = {"form_data": result["form_data"].to_dict()}
+                yield {"url": url, **result}
+            except Exception as e:  # tek bir URL'deki beklenmedik hata tüm toplu işi durdurmasın
+                yield {"url": url, "error": f"Beklenmeyen hata: {e}"}
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_ndjson(items):
+    for item in items:
+        yield json.dumps(item, ensure_ascii=False).encode('utf-8') + b'\n'
+
+
+# --- Görsel Vekili ---
+# Soru ve seçenek görselleri Google'dan bir kez indirilir, CSS'teki en büyük boyuta küçültülüp
+# yeniden sıkıştırılır ve diskte (SQLite, LRU) saklanır. Tarayıcılar uzun süre önbellekte tutar.
+# Vekil yalnızca Google'ın görsel sunucularından (https) indirir ve SECRET_KEY tanımlı değilse çalışmaz:
+# imza anahtarı herkesin bildiği geliştirme değeriyken imzalar taklit edilebilir.
+IMAGE_PROXY = os.environ.get("IMAGE_PROXY", "1") == "1"
+IMAGE_HOST_SUFFIXES = ('.googleusercontent.com', '.ggpht.com')
+IMAGE_MAX_REDIRECTS = 3
+IMAGE_CACHE_PATH = os.environ.get(
+    "IMAGE_CACHE_PATH", os.path.join(tempfile.gettempdir(), "formklon_images.sqlite3"))
+IMAGE_CACHE_MAX_BYTES = int(os.environ.get("IMAGE_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+IMAGE_CACHE_MAX_ENTRIES = int(os.environ.get("IMAGE_CACHE_MAX_ENTRIES", 20000))
+IMAGE_MAX_SOURCE_BYTES = int(os.environ.get("IMAGE_MAX_SOURCE_BYTES", 10 * 1024 * 1024))
+IMAGE_QUALITY = int(os.environ.get("IMAGE_QUALITY", 80))
+# Yüksek çözünürlüklü ekranlar için CSS pikseli başına üretilen piksel sayısı
+IMAGE_PIXEL_DENSITY = float(os.environ.get("IMAGE_PIXEL_DENSITY", 2))
+IMAGE_BROWSER_MAX_AGE = 30 * 24 * 3600
+# Varyant -> CSS'teki en büyük (genişlik, yükseklik). 'q': .form-image-container img
+# (kart içi genişlik 680px, max-height 450px), 'o': .option-image-container img (max-width 260px).
+IMAGE_VARIANTS = {'q': (680, 450), 'o': (260, None)}
+# Görsel indirmelerinin kendi eşzamanlılık sınırı; form analizleriyle aynı havuzu paylaşmaz,
+# görselli büyük bir formun ilk gösterimi klonlama isteklerini UpstreamBusy'ye düşürmez.
+IMAGE_MAX_CONCURRENCY = int(os.environ.get("IMAGE_MAX_CONCURRENCY", 8))
+IMAGE_QUEUE_TIMEOUT = float(os.environ.get("IMAGE_QUEUE_TIMEOUT", 5))
+# Uygulamanın kendi adresinden yalnızca bu raster türler sunulur; SVG, HTML vb. orijinal adrese yönlendirilir
+RASTER_IMAGE_TYPES = frozenset({'image/jpeg', 'image/png', 'image/gif', 'image/webp', 'image/avif', 'image/bmp'})
+
+_image_slots = threading.BoundedSemaphore(IMAGE_MAX_CONCURRENCY)
+
+
+@lru_cache(maxsize=1)
+def get_image_store():
+    """Görsel önbelleği ilk kullanımda açılır; görsel içermeyen kurulumlar dosya oluşturmaz."""
+    return SQLiteStore(IMAGE_CACHE_PATH, 'images', IMAGE_CACHE_MAX_ENTRIES, IMAGE_CACHE_MAX_BYTES)
+
+
+def image_proxy_enabled() -> bool:
+    return IMAGE_PROXY and bool(current_app.secret_key) and current_app.secret_key != DEV_SECRET_KEY
+
+
+def is_proxyable_image_url(url: str) -> bool:
+    """Yalnızca Google görsel sunucularındaki https adresleri; iç ağ adresleri ve diğer siteler vekillenmez."""
+    try:
+        parts = urlsplit(url)
+        host = parts.hostname
+    except ValueError:
+        return False
+    return parts.scheme == 'https' and not parts.username and not parts.password \
+        and bool(host) and host.endswith(IMAGE_HOST_SUFFIXES)
+
+
+def image_signature(url: str) -> str:
+    """Vekilin yalnızca uygulamanın ürettiği görsel adreslerini indirmesi için URL imzası."""
+    key = current_app.secret_key.encode('utf-8')
+    return hmac.new(key, url.encode('utf-8'), hashlib.sha256).hexdigest()[:24]
+
+
+@bp.app_template_filter('proxied_image')
+def proxied_image(url: str, variant: str) -> str:
+    if not url or not is_proxyable_image_url(url) or not image_proxy_enabled():
+        return url
+    return url_for('formklon.image_proxy', variant=variant, u=url, s=image_signature(url))
+
+
+def fetch_image(url: str):
+    """
+    Görseli indirir; (içerik türü, bayt) ya da tür raster görsel değilse veya boyut sınırı aşılırsa None döndürür.
+    Yer, gövde tamamen okunana kadar görsel havuzunda tutulur.
+    """
+    if not _image_slots.acquire(timeout=IMAGE_QUEUE_TIMEOUT):
+        raise UpstreamBusy("Görsel indirme sınırı dolu.")
+    try:
+        return _download_image(url)
+    finally:
+        _image_slots.release()
+
+
+def _download_image(url: str):
+    # Yönlendirmeler elle izlenir; her adımda hedefin yine bir Google görsel sunucusu olduğu doğrulanır
+    for _ in range(IMAGE_MAX_REDIRECTS + 1):
+        resp = get_http_session().get(url, timeout=15, stream=True, allow_redirects=False)
+        if not resp.is_redirect:
+            break
+        resp.close()
+        url = urljoin(url, resp.headers.get('Location', ''))
+        if not is_proxyable_image_url(url):
+            return None
+    else:
+        return None
+    with resp:
+        resp.raise_for_status()
+        mimetype = resp.headers.get('Content-Type', 'application/octet-stream').split(';', 1)[0].strip().lower()
+        if mimetype not in RASTER_IMAGE_TYPES:
+            return None
+        if int(resp.headers.get('Content-Length') or 0) > IMAGE_MAX_SOURCE_BYTES:
+            return None
+        chunks, size = [], 0
+        for chunk in resp.iter_content(64 * 1024):
+            size += len(chunk)
+            if size > IMAGE_MAX_SOURCE_BYTES:
+                return None
+            chunks.append(chunk)
+        return mimetype, b''.join(chunks)
+
+
+def resize_image(data: bytes, variant: str):
+    """
+    Görseli varyantın sınırlarına sığacak şekilde küçültür; saydamlık varsa PNG, yoksa JPEG üretir.
+    Hareketli görseller ve zaten küçük olup yeniden sıkıştırmayla büyüyecek dosyalar olduğu gibi bırakılır.
+    Dönüş: (içerik türü, bayt) veya değişiklik gerekmiyorsa None.
+    """
+    from PIL import Image, ImageOps
+
+    max_width, max_height = IMAGE_VARIANTS[variant]
+    with Image.open(io.BytesIO(data)) as img:
+        if getattr(img, 'is_animated', False):
+            return None
+        img = ImageOps.exif_transpose(img)
+        scale = min(1.0, max_width * IMAGE_PIXEL_DENSITY / img.width,
+                    max_height * IMAGE_PIXEL_DENSITY / img.height if max_height else 1.0)
+        if scale < 1.0:
+            img = img.resize((max(1, round(img.width * scale)), max(1, round(img.height * scale))),
+                             Image.Resampling.LANCZOS)
+        out = io.BytesIO()
+        if img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info):
+            img.save(out, 'PNG', optimize=True)
+            mimetype = 'image/png'
+        else:
+            img.convert('RGB').save(out, 'JPEG', quality=IMAGE_QUALITY, optimize=True, progressive=True)
+            mimetype = 'image/jpeg'
+    if scale >= 1.0 and out.tell() >= len(data):
+        return None
+    return mimetype, out.getvalue()
+
+
+def proxied_image_bytes(url: str, variant: str):
+    """Önbellekteki varyantı döndürür, yoksa üretip saklar. Dönüş: (içerik türü, bayt, etag) veya None."""
+    key = f"{variant}:{hashlib.sha1(url.encode('utf-8')).hexdigest()}"
+    store = get_image_store()
+    raw = store.get(key)
+    if raw is not None:
+        metrics.inc('formklon_cache_total', (('cache', 'image'), ('result', 'hit')))
+    else:
+        metrics.inc('formklon_cache_total', (('cache', 'image'), ('result', 'miss')))
+        with span('image_fetch'):
+            fetched = fetch_image(url)
+        if fetched is None:
+            return None
+        mimetype, data = fetched
+        try:
+            with span('image_resize'):
+                resized = resize_image(data, variant)
+        except Exception:  # Pillow'un çözemediği raster dosyalar (ör. AVIF) olduğu gibi sunulur
+            resized = None
+        if resized is not None:
+            mimetype, data = resized
+        raw = mimetype.encode('ascii') + b'\n' + data
+        store.set(key, raw)
+    mimetype, _, data = raw.partition(b'\n')
+    mimetype = mimetype.decode('ascii')
+    if mimetype not in RASTER_IMAGE_TYPES:  # eski sürümlerin önbelleğe aldığı SVG vb.
+        return None
+    return mimetype, data, key.replace(':', '-')
+
+
+# --- Şablon Yükleme ---
+@lru_cache(maxsize=64)
+def render_static_page(error: str = None):
+    """
+    Form içermeyen sayfaları (giriş sayfası, sabit hata mesajları) bir kez üretir.
+    Dönüş: (html_bytes, etag)
+    """
+    body = current_app.jinja_env.get_template('form.html').render(error=error).encode('utf-8')
+    return body, hashlib.sha1(body).hexdigest()
+
+
+def static_page_response(error: str = None, status: int = 200):
+    body, etag = render_static_page(error)
+    response = make_response(body, status)
+    response.mimetype = 'text/html'
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request) if request.method == 'GET' else response
+
+
 # --- Flask Rotaları ---
-@app.route('/', methods=['GET', 'POST'])
+@bp.route('/', methods=['GET', 'POST'])
 def index():
     if request.method == 'POST':
         url = request.form.get('url', '').strip()
-        if not url or ("docs.google.com/forms" not in url and "forms.gle" not in url):
-            return render_template_string(HTML_TEMPLATE, error="Geçerli bir Google Form URL'si girin.")
+        if not is_google_form_url(url):
+            return static_page_response(error="Geçerli bir Google Form URL'si girin.")
         
-        result = analyze_google_form(url)
+        with span('analyze'):
+            result = analyze_google_form(url)
         if "error" in result:
-            return render_template_string(HTML_TEMPLATE, error=result["error"])
+            return render_template('form.html', error=result["error"])
         
-        session['form_structure'] = result['form_data']
-        return render_template_string(HTML_TEMPLATE, form_data=result['form_data'])
+        # Anahtar sayfaya (gizli alan ve bölüm adresleri) yazılır; session'daki tek bir yuvaya
+        # konmaz, böylece farklı sekmelerde açılan formlar birbirinin yapısını ezmez.
+        with span('structure_save'):
+            form_token = save_form_structure(result['form_data'])
+        with span('render'):
+            return render_template('form.html', form_data=result['form_data'], form_token=form_token,
+                                   lazy_sections=use_lazy_sections(result['form_data']))
     
-    return render_template_string(HTML_TEMPLATE)
+    return static_page_response()
 
-@app.route('/submit', methods=['POST'])
+@bp.route('/submit', methods=['POST'])
 def submit():
-    form_structure = session.get('form_structure')
+    # Eski sürümün sayfaları anahtarı yalnızca session'da taşır
+    form_token = request.form.get('form_token') or session.get('form_token')
+    with span('structure_load'):
+        form_structure = load_form_structure(form_token)
     if not form_structure:
         return "Hata: Form yapısı bulunamadı. Lütfen formu ana sayfadan tekrar oluşturun.", 400
 
     user_answers = request.form
-    results = []
-    
-    all_questions = [q for page in form_structure.get('pages', []) for q in page]
-
-    for question in all_questions:
-        q_type = question.get('type')
-        if not q_type or q_type == 'Başlık': continue
-
-        # DÜZELTME: EXCEL HATASI
-        q_text_html = question.get('text', '')
-        q_text_plain = BeautifulSoup(q_text_html, "html.parser").get_text(separator=" ", strip=True) or f"İsimsiz Soru ({q_type})"
-        
-        answer_str = "Yanıtlanmadı"
-
-        if 'Tablo' in q_type:
-            for row in question.get('rows', []):
-                rid = row.get('entry_id')
-                if not rid: continue
-                row_label = f"{q_text_plain} [{row.get('text', '')}]"
-                if 'Onay' in q_type:
-                    val = ', '.join(user_answers.getlist(rid)) or "Yanıtlanmadı"
-                else:
-                    val = user_answers.get(rid, "Yanıtlanmadı")
-                results.append({"Soru": row_label, "Cevap": val})
-            continue
-
-        entry = question.get('entry_id')
-        if not entry: continue
-        
-        if q_type == 'Onay Kutuları':
-            answers = user_answers.getlist(entry)
-            final = []
-            if "__other_option__" in answers:
-                answers.remove("__other_option__")
-                other_txt = user_answers.get(f"{entry}.other_option_response", "").strip()
-                final.append(f"Diğer: {other_txt}" if other_txt else "Diğer")
-            final.extend(answers)
-            if final: answer_str = ', '.join(final)
-        elif q_type == 'Çoktan Seçmeli':
-            ans = user_answers.get(entry)
-            if ans == "__other_option__":
-                other_txt = user_answers.get(f"{entry}.other_option_response", "").strip()
-                answer_str = f"Diğer: {other_txt}" if other_txt else "Diğer"
-            elif ans: answer_str = ans
-        else:
-            raw_answer = user_answers.get(entry, "")
-            if raw_answer: answer_str = raw_answer
-
-        results.append({"Soru": q_text_plain, "Cevap": answer_str})
-
-    df = pd.DataFrame(results)
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        sheet_name = 'Form Yanıtları'
-        df.to_excel(writer, index=False, sheet_name=sheet_name)
-        ws = writer.sheets[sheet_name]
-        for i, col in enumerate(df.columns):
-            max_len = max(df[col].astype(str).map(len).max(), len(col)) + 2
-            ws.column_dimensions[chr(65 + i)].width = min(max_len, 70)
-    output.seek(0)
-    session.pop('form_structure', None)
+    duplicate = False
+    if FORWARD_RESPONSES and form_structure.response_url:
+        # Anahtar başına tek iletim: aynı yapıyla ikinci gönderim Google'a tekrar gitmez, arşive de eklenmez
+        try:
+            with span('forward_enqueue'):
+                duplicate = not forward_queue.enqueue(
+                    form_structure.form_id, form_structure.response_url,
+                    form_response_payload(form_structure, user_answers),
+                    dedupe_key=hashlib.sha256(form_token.encode('utf-8')).hexdigest(),
+                )
+        except sqlite3.Error:
+            # Kuyruk yazılamazsa yanıt Google'a iletilmez ama kullanıcı Excel dosyasını yine alır
+            current_app.logger.exception("Yanıt iletim kuyruğuna eklenemedi (form %s)", form_structure.form_id)
+            metrics.inc('formklon_store_errors_total', (('store', 'forward'),))
+    if RESPONSE_COLLECTION and form_structure.form_id and not duplicate:
+        try:
+            with span('response_store'):
+                response_store.append(form_structure, iter_answer_rows(form_structure, user_answers))
+        except sqlite3.Error:
+            # Arşiv isteğe bağlıdır; kilit veya disk hatası kullanıcının Excel indirmesini engellemez
+            current_app.logger.exception("Yanıt arşive yazılamadı (form %s)", form_structure.form_id)
+            metrics.inc('formklon_store_errors_total', (('store', 'responses'),))
+    with span('export'):
+        output = write_xlsx(
+            ('Soru', 'Cevap'),
+            lambda: ((label, answer) for _, label, answer in iter_answer_rows(form_structure, user_answers)),
+            'Form Yanıtları',
+        )
+    structure_store.delete(form_token)
+    session.pop('form_token', None)
     
     return send_file(
         output,
-        mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        mimetype=XLSX_MIMETYPE,
         as_attachment=True,
         download_name=f'form_yanitlari_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
     )
 
+@bp.route('/responses/<form_id>/export.<fmt>')
+def export_responses(form_id, fmt):
+    if not EXPORT_TOKEN or not response_store:
+        return "Hata: Toplu dışa aktarma kapalı.", 403
+    token = request.headers.get('Authorization', '').removeprefix('Bearer ').strip()
+    if not hmac.compare_digest(token, EXPORT_TOKEN):
+        return "Hata: Geçersiz dışa aktarma anahtarı.", 403
+
+    columns = response_store.columns(form_id)
+    if columns is None:
+        return "Hata: Bu form için kayıtlı yanıt bulunamadı.", 404
+    headers = export_headers(columns)
+    download_name = f'form_yanitlari_{form_id}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.{fmt}'
+
+    if fmt == 'csv':
+        return Response(
+            iter_csv_chunks(headers, response_store.iter_rows(form_id, columns)),
+            mimetype='text/csv',
+            headers={'Content-Disposition': f'attachment; filename="{download_name}"'},
+        )
+    if fmt == 'xlsx':
+        output = write_xlsx(headers, lambda: response_store.iter_rows(form_id, columns), 'Form Yanıtları')
+        return send_file(output, mimetype=XLSX_MIMETYPE, as_attachment=True, download_name=download_name)
+    if fmt == 'parquet':
+        try:
+            output = write_parquet(headers, response_store.iter_rows(form_id, columns))
+        except ImportError:
+            return "Hata: Parquet dışa aktarımı için 'pyarrow' paketi kurulu olmalı.", 501
+        return send_file(output, mimetype='application/vnd.apache.parquet', as_attachment=True,
+                         download_name=download_name)
+    return "Hata: Desteklenen biçimler: csv, xlsx, parquet.", 400
+
+
+@bp.route('/api/batch', methods=['POST'])
+def batch_analyze():
+    """Gövde: {"urls": [...]}. Her URL'nin sonucu hazır oldukça NDJSON satırı olarak gönderilir."""
+    if not BATCH_TOKEN:
+        return {"error": "Toplu analiz kapalı."}, 403
+    token = request.headers.get('Authorization', '').removeprefix('Bearer ').strip()
+    if not hmac.compare_digest(token, BATCH_TOKEN):
+        return {"error": "Geçersiz anahtar."}, 403
+    payload = request.get_json(silent=True) or {}
+    urls = payload.get('urls')
+    if not isinstance(urls, list) or not all(isinstance(u, str) for u in urls):
+        return {"error": "Gövde {\"urls\": [...]} biçiminde bir URL listesi olmalı."}, 400
+    if len(urls) > BATCH_MAX_URLS:
+        return {"error": f"Tek istekte en fazla {BATCH_MAX_URLS} URL gönderilebilir."}, 413
+    urls = [u.strip() for u in urls]
+    return Response(iter_ndjson(iter_batch_analysis(urls)), mimetype='application/x-ndjson')
+
+
+@bp.route('/api/form/<form_id>')
+def form_api(form_id):
+    """'/forms/d/e/<form_id>' formunun ayrıştırılmış yapısı (önbellekten veya yeni analizle)."""
+    if not FORM_ID_CHARS_RE.fullmatch(form_id):
+        return {"error": "Geçersiz form kimliği."}, 404
+    result = analyze_google_form(f"https://docs.google.com/forms/d/e/{form_id}/viewform")
+    if "error" in result:
+        return {"error": result["error"]}, 502
+    return json_response(result['form_data'].to_dict())
+
+
+@bp.route('/api/form/<form_id>/history')
+def form_history_api(form_id):
+    """Formun kayıtlı yapı sürümleri; her sürüm yapının ilk ve son görüldüğü zamanı içerir."""
+    if not form_history:
+        return {"error": "Yapı geçmişi kapalı."}, 404
+    versions = form_history.versions(form_id)
+    if not versions:
+        return {"error": "Bu form için kayıtlı sürüm bulunamadı."}, 404
+    return json_response({
+        'form_id': form_id,
+        'versions': [
+            {'fingerprint': fingerprint,
+             'first_seen': datetime.fromtimestamp(first_seen).isoformat(timespec='seconds'),
+             'last_seen': datetime.fromtimestamp(last_seen).isoformat(timespec='seconds'),
+             'questions': questions}
+            for fingerprint, first_seen, last_seen, questions in versions
+        ],
+    })
+
+
+@bp.route('/form/sections/<int:index>')
+def form_section(index):
+    """Anahtarı ('t') verilen formun tek bir bölümünü HTML parçası olarak döndürür (tembel gösterim)."""
+    with span('structure_load'):
+        form_structure = load_form_structure(request.args.get('t') or session.get('form_token'))
+    if not form_structure:
+        return "Hata: Form oturumu bulunamadı veya süresi doldu.", 404
+    if index >= len(form_structure.pages):
+        return "Hata: Böyle bir bölüm yok.", 404
+    with span('render'):
+        body = render_template('section.html', page=form_structure.pages[index], number=index + 1,
+                               total=len(form_structure.pages))
+    response = make_response(body)
+    # Yapı gönderimden sonra silinir; parça tarayıcı önbelleğine alınmaz
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+
+@bp.route('/img/<variant>')
+def image_proxy(variant):
+    import requests
+
+    url = request.args.get('u', '')
+    if not image_proxy_enabled() or variant not in IMAGE_VARIANTS or not is_proxyable_image_url(url) \
+            or not hmac.compare_digest(request.args.get('s', '').encode('utf-8'), image_signature(url).encode('utf-8')):
+        return "Hata: Geçersiz görsel adresi.", 404
+    try:
+        result = proxied_image_bytes(url, variant)
+    except (requests.RequestException, UpstreamBusy) as e:
+        metrics.inc('formklon_upstream_errors_total', (('kind', upstream_error_kind(e)),))
+        result = None
+    if result is None:
+        # Vekil görseli sunamıyorsa tarayıcı orijinal adrese yönlendirilir (önbelleğe alınmaz)
+        response = redirect(url)
+        response.headers['Cache-Control'] = 'no-store'
+        return response
+    mimetype, data, etag = result
+    response = make_response(data)
+    response.mimetype = mimetype
+    response.headers['X-Content-Type-Options'] = 'nosniff'
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = f'public, max-age={IMAGE_BROWSER_MAX_AGE}, immutable'
+    return response.make_conditional(request)
+
+
+@click.command('batch-clone')
+@click.argument('source', type=click.File('r', encoding='utf-8'), default='-')
+@click.option('--workers', default=BATCH_WORKERS, show_default=True, help="Aynı anda analiz edilecek form sayısı.")
+def batch_clone_command(source, workers):
+    """SOURCE dosyasındaki (her satırda bir URL; varsayılan stdin) formları analiz edip NDJSON yazar."""
+    urls = [line.strip() for line in source if line.strip() and not line.lstrip().startswith('#')]
+    for line in iter_ndjson(iter_batch_analysis(urls, workers)):
+        click.echo(line.rstrip(b'\n').decode('utf-8'))
+
+
+@click.command('forward-requeue')
+@click.option('--form-id', default=None, help="Yalnızca bu formun ölü mektuplarını geri al.")
+def forward_requeue_command(form_id):
+    """Google'a iletilemeyen yanıtları (ölü mektuplar) yeniden iletim kuyruğuna alır."""
+    if not forward_queue:
+        raise click.ClickException("FORWARD_RESPONSES kapalı.")
+    moved = forward_queue.requeue_dead(form_id)
+    pending, dead = forward_queue.counts()
+    click.echo(f"{moved} yanıt kuyruğa alındı (bekleyen: {pending}, ölü mektup: {dead}).")
+
+
+@bp.route('/metrics')
+def metrics_endpoint():
+    if METRICS_TOKEN:
+        token = request.headers.get('Authorization', '').removeprefix('Bearer ').strip()
+        if not hmac.compare_digest(token, METRICS_TOKEN):
+            return "Hata: Geçersiz anahtar.", 403
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+
+@bp.before_app_request
+def resume_forwarding():
+    # Önceki çalıştırmadan kalan işler, yeni bir gönderim beklemeden iletilmeye başlar
+    if forward_queue:
+        forward_queue.start()
+
+
+@bp.before_app_request
+def start_request_profile():
+    if PROFILE_SAMPLE_RATE and request.endpoint != 'formklon.metrics_endpoint' and random.random() < PROFILE_SAMPLE_RATE:
+        import cProfile
+
+        g.profiler = cProfile.Profile()
+        g.profiler.enable()
+
+
+@bp.after_app_request
+def finish_request_metrics(response):
+    metrics.inc('formklon_requests_total', (('endpoint', request.endpoint or 'unknown'), ('status', response.status_code)))
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profiler.disable()
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        name = f"{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}_{request.endpoint or 'unknown'}_{os.getpid()}.prof"
+        profiler.dump_stats(os.path.join(PROFILE_DIR, name))
+    if SERVER_TIMING and g.get('stage_timings'):
+        response.headers['Server-Timing'] = ', '.join(
+            f'{stage};dur={seconds * 1000:.1f}' for stage, seconds in g.stage_timings)
+    return response
+
+
+# --- Uygulama Fabrikası ---
+# SECRET_KEY tanımlı değilse kullanılan geliştirme anahtarı; bu durumda görsel vekili kapalıdır
+DEV_SECRET_KEY = "a-very-secure-dev-fallback-key-indeed"
+
+
+def warm_imports():
+    """Ağır bağımlılıkları önceden yükler (bkz. WARM_IMPORTS)."""
+    import requests  # noqa: F401
+    import bs4  # noqa: F401
+    import openpyxl  # noqa: F401
+    import requests.adapters  # noqa: F401
+
+
+def create_app():
+    """
+    Flask uygulamasını kurar. 'gunicorn "app:create_app()" --preload' ile kullanılabilir;
+    modül içeriği fork öncesinde açık bağlantı veya thread bırakmaz.
+    """
+    flask_app = Flask(__name__)
+    flask_app.secret_key = os.environ.get("SECRET_KEY", DEV_SECRET_KEY)
+    if IMAGE_PROXY and flask_app.secret_key == DEV_SECRET_KEY:
+        logger.warning("SECRET_KEY tanımlı değil; görsel vekili kapalı, görseller doğrudan Google'dan yüklenecek.")
+    # Şablonlar bellekteki sözlükten yüklenir; Jinja bunları ilk kullanımda derleyip önbellekte tutar.
+    flask_app.jinja_env.loader = ChoiceLoader([
+        flask_app.jinja_env.loader,
+        DictLoader({'form.html': HTML_TEMPLATE, 'questions.html': QUESTION_MACROS, 'section.html': SECTION_TEMPLATE}),
+    ])
+    flask_app.register_blueprint(bp)
+    flask_app.cli.add_command(batch_clone_command)
+    flask_app.cli.add_command(forward_requeue_command)
+    if WARM_IMPORTS:
+        warm_imports()
+    return flask_app
+
+
+app = create_app()
+
+
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
     app.run(host='0.0.0.0', port=port, debug=True)
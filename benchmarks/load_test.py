@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+Eşzamanlı form klonlama yük testi.
+
+Yerel bir Google Forms taklidini (gecikmeli) ve uygulamayı gunicorn ile başlatır,
+ardından '/' adresine aynı anda çok sayıda klonlama isteği gönderir. Her istek
+farklı bir form kimliği kullandığı için önbellek devreye girmez; ölçülen şey
+worker'ların ağ beklemelerini ne kadar örtüştürebildiğidir.
+
+    python benchmarks/load_test.py --concurrency 50 --requests 200 --delay 0.5
+    python benchmarks/load_test.py --worker-class sync --threads 1   # karşılaştırma için
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from standin import start_standin  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))], 4)
+
+
+def wait_until_ready(url: str, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            requests.get(url, timeout=1)
+            return
+        except requests.RequestException:
+            time.sleep(0.2)
+    raise RuntimeError(f"Uygulama {timeout} sn içinde hazır olmadı: {url}")
+
+
+def run(args):
+    standin, upstream = start_standin(delay=args.delay)
+    app_url = f"http://127.0.0.1:{args.port}"
+    env = dict(os.environ, UPSTREAM_BASE_URL=upstream, STRUCTURE_STORE_BACKEND='memory')
+    cmd = [sys.executable, '-m', 'gunicorn', 'app:app', '--bind', f'127.0.0.1:{args.port}',
+           '--workers', str(args.workers), '--worker-class', args.worker_class,
+           '--threads', str(args.threads), '--timeout', '120', '--log-level', 'warning']
+    server = subprocess.Popen(cmd, cwd=ROOT, env=env)
+    try:
+        wait_until_ready(app_url)
+        run_id = uuid.uuid4().hex[:8]
+
+        def clone(i):
+            form_url = f"https://docs.google.com/forms/d/e/load-{run_id}-{i}-q{args.questions}/viewform"
+            started = time.perf_counter()
+            try:
+                resp = requests.post(app_url + '/', data={'url': form_url}, timeout=120)
+                ok = resp.status_code == 200 and b'clone-form' in resp.content
+            except requests.RequestException:
+                ok = False
+            return ok, time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            results = list(pool.map(clone, range(args.requests)))
+        elapsed = time.perf_counter() - started
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+        standin.shutdown()
+
+    latencies = [lat for ok, lat in results if ok]
+    report = {
+        'worker_class': args.worker_class,
+        'workers': args.workers,
+        'threads': args.threads,
+        'concurrency': args.concurrency,
+        'requests': args.requests,
+        'upstream_delay_s': args.delay,
+        'errors': sum(1 for ok, _ in results if not ok),
+        'elapsed_s': round(elapsed, 3),
+        'throughput_rps': round(len(latencies) / elapsed, 2) if elapsed else None,
+        'latency_s': {
+            'p50': percentile(latencies, 50),
+            'p95': percentile(latencies, 95),
+            'p99': percentile(latencies, 99),
+            'mean': round(statistics.fmean(latencies), 4) if latencies else None,
+        },
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--delay', type=float, default=0.5, help="Taklit Google yanıt gecikmesi (saniye)")
+    parser.add_argument('--questions', type=int, default=30)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--worker-class', default='gthread')
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--port', type=int, default=8799)
+    run(parser.parse_args())
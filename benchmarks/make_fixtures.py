@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark fikstürlerini (benchmarks/fixtures/*.html) yeniden üretir.
+
+Fikstürler gerçek form sayfalarının yapısını taklit eder: FB_PUBLIC_LOAD_DATA_ betiği,
+'data-item-id' kapsayıcıları, seçenek görselleri (img.L05vke), zengin metin açıklaması (div.cBGGJ).
+Her boyutta tüm soru tipleri (tablolar, "Diğer" seçenekleri, görselli seçenekler) bulunur.
+
+    python benchmarks/make_fixtures.py
+"""
+
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+
+from standin import make_form_html  # noqa: E402
+
+FIXTURES_DIR = os.path.join(HERE, 'fixtures')
+
+# ad -> (soru sayısı, bölüm sayısı)
+FIXTURES = {
+    'small': (10, 1),
+    'medium': (50, 3),
+    'large': (200, 10),
+    'xlarge_sections': (500, 20),
+}
+
+
+def main():
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    for name, (questions, sections) in FIXTURES.items():
+        path = os.path.join(FIXTURES_DIR, f'{name}.html')
+        with open(path, 'w', encoding='utf-8') as fh:
+            fh.write(make_form_html(questions, sections))
+        print(f"{path}: {questions} soru, {sections} bölüm")
+
+
+if __name__ == '__main__':
+    main()
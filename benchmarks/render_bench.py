@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+Form sayfası render benchmark'ı.
+
+Büyük, çok bölümlü sentetik bir formu önbellekteki derlenmiş şablonla render eder ve
+her seferinde kaynaktan derlemenin (eski render_template_string davranışı) maliyetiyle karşılaştırır.
+Tembel bölüm modunda (yalnızca ilk bölüm sayfayla gelir) ilk sayfanın süresi ve boyutu da ölçülür.
+
+    python benchmarks/render_bench.py --questions 300 --sections 20 --repeat 50
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.dirname(HERE))
+
+import app  # noqa: E402
+from standin import make_form_html  # noqa: E402
+
+
+def measure(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    timings.sort()
+    return {
+        'mean_ms': round(statistics.fmean(timings) * 1000, 3),
+        'p95_ms': round(timings[int(0.95 * (len(timings) - 1))] * 1000, 3),
+        'peak_alloc_kb': round(peak / 1024, 1),
+    }
+
+
+def main(args):
+    form_data = app.parse_google_form_html(make_form_html(args.questions, args.sections))['form_data']
+    source = app.HTML_TEMPLATE
+
+    with app.app.test_request_context():
+        app.render_template('form.html', form_data=form_data)  # ilk derleme
+        cached = measure(lambda: app.render_template('form.html', form_data=form_data), args.repeat)
+        recompiled = measure(lambda: app.app.jinja_env.from_string(source).render(form_data=form_data), args.repeat)
+        lazy = measure(lambda: app.render_template('form.html', form_data=form_data, lazy_sections=True), args.repeat)
+        landing = measure(lambda: app.static_page_response(), args.repeat)
+        full_bytes = len(app.render_template('form.html', form_data=form_data).encode('utf-8'))
+        lazy_bytes = len(app.render_template('form.html', form_data=form_data, lazy_sections=True).encode('utf-8'))
+
+    print(json.dumps({
+        'questions': args.questions,
+        'sections': args.sections,
+        'cached_template': cached,
+        'compile_every_request': recompiled,
+        'lazy_first_section': lazy,
+        'page_bytes': {'full': full_bytes, 'lazy_first_section': lazy_bytes},
+        'static_landing_page': landing,
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--questions', type=int, default=300)
+    parser.add_argument('--sections', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=50)
+    main(parser.parse_args())
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""
+Çevrimdışı benchmark paketi.
+
+benchmarks/fixtures/ altındaki sentetik form sayfalarını (make_fixtures.py) yerel Google Forms taklidinden
+sunar ve her fikstür için şu aşamaları ölçer:
+
+- fetch:        form sayfasının (bağlantı havuzu üzerinden) indirilmesi
+- short_link:   forms.gle yönlendirmesinin çözülmesi (ilk çağrı, önbelleksiz)
+- parse:        parse_google_form_html()
+- analyze:      analyze_google_form() uçtan uca (önbellek ve yapı geçmişi kapalı)
+- refresh:      değişmemiş formun yeniden analizi (özet eşleşir, ayrıştırma atlanır)
+- render:       form sayfasının render edilmesi
+- export:       tek yanıtlık Excel dosyasının üretilmesi
+
+Her aşama için gecikme yüzdelikleri (ms), saniyedeki işlem sayısı ve tepe bellek
+(tracemalloc) JSON olarak yazılır; --compare ile önceki bir çıktıya göre oranlar eklenir.
+
+    python benchmarks/run_suite.py --repeat 30 --output bench.json
+    python benchmarks/run_suite.py --compare bench.json
+"""
+
+import argparse
+import glob
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, HERE)
+sys.path.insert(0, ROOT)
+
+# Ölçümler önbelleklere ve diske yazılan yanıtlara takılmasın
+os.environ.update({
+    'FORM_CACHE_BACKEND': 'memory',
+    'FORM_CACHE_TTL': '0',
+    'STRUCTURE_STORE_BACKEND': 'memory',
+    'RESPONSE_COLLECTION': '0',
+    'FORWARD_RESPONSES': '0',
+    'FORM_HISTORY_DB_PATH': os.path.join(tempfile.mkdtemp(prefix='formklon_bench_'), 'form_history.sqlite3'),
+})
+
+import app  # noqa: E402
+from standin import start_standin  # noqa: E402
+from submit_bench import sample_answers  # noqa: E402
+
+FIXTURES_DIR = os.path.join(HERE, 'fixtures')
+
+
+def stage(fn, repeat):
+    """fn'i repeat kez çalıştırır; yüzdelikler, işlem/sn ve tek çağrının tepe belleği."""
+    fn()  # ısınma
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    timings.sort()
+
+    def pct(p):
+        return round(timings[min(len(timings) - 1, int(round(p / 100 * (len(timings) - 1))))] * 1000, 3)
+
+    return {
+        'p50_ms': pct(50), 'p95_ms': pct(95), 'p99_ms': pct(99),
+        'ops_per_s': round(len(timings) / sum(timings), 2),
+        'peak_kb': round(peak / 1024, 1),
+    }
+
+
+def version_info():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {'commit': commit, 'python': platform.python_version(), 'platform': platform.platform()}
+
+
+def bench_fixture(name, html, base_url, repeat):
+    form_id = f'fixture-{name}'
+    form_url = f'https://docs.google.com/forms/d/e/{form_id}/viewform'
+    parsed = app.parse_google_form_html(html)
+    if 'error' in parsed:
+        raise RuntimeError(f"{name}: {parsed['error']}")
+    form_data = parsed['form_data']
+    answers = sample_answers(form_data)
+    short_links = iter(range(10 ** 9))
+
+    def fetch():
+        app.upstream_request('GET', form_url, timeout=15).raise_for_status()
+
+    def short_link():
+        # Her çağrıda farklı kod: önbellek yerine gerçek yönlendirme ölçülür
+        app.resolve_short_link(f'https://forms.gle/{form_id}-{next(short_links)}')
+
+    def analyze():
+        result = app.analyze_google_form(form_url)
+        assert 'form_data' in result, result
+
+    def render():
+        with app.app.test_request_context():
+            app.render_template('form.html', form_data=form_data)
+
+    def export():
+        app.write_xlsx(
+            ('Soru', 'Cevap'),
+            lambda: ((label, answer) for _, label, answer in app.iter_answer_rows(form_data, answers)),
+            'Form Yanıtları',
+        ).close()
+
+    history, app.form_history = app.form_history, None
+    try:
+        analyze_stats = stage(analyze, repeat)
+    finally:
+        app.form_history = history
+
+    return {
+        'bytes': len(html.encode('utf-8')),
+        'questions': sum(1 for q in form_data.questions() if q.kind is not app.QuestionKind.HEADER),
+        'sections': len(form_data.pages),
+        'stages': {
+            'fetch': stage(fetch, repeat),
+            'short_link': stage(short_link, repeat),
+            'parse': stage(lambda: app.parse_google_form_html(html), repeat),
+            'analyze': analyze_stats,
+            'refresh': stage(analyze, repeat),
+            'render': stage(render, repeat),
+            'export': stage(export, repeat),
+        },
+    }
+
+
+def compare(report, baseline):
+    """Her aşamanın p50 değerini önceki çıktıya oranlar (>1 yavaşlama demektir)."""
+    ratios = {}
+    for name, fixture in report['fixtures'].items():
+        old = baseline.get('fixtures', {}).get(name)
+        if not old:
+            continue
+        ratios[name] = {
+            stage_name: round(values['p50_ms'] / old['stages'][stage_name]['p50_ms'], 3)
+            for stage_name, values in fixture['stages'].items()
+            if old['stages'].get(stage_name, {}).get('p50_ms')
+        }
+    return ratios
+
+
+def main(args):
+    fixtures = {
+        os.path.splitext(os.path.basename(path))[0]: open(path, encoding='utf-8').read()
+        for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, '*.html')))
+    }
+    if args.only:
+        fixtures = {name: html for name, html in fixtures.items() if name in args.only}
+    server, base_url = start_standin(pages={f'fixture-{name}': html for name, html in fixtures.items()})
+    app.UPSTREAM_BASE_URL = base_url
+    try:
+        report = {
+            'version': version_info(),
+            'repeat': args.repeat,
+            'fixtures': {name: bench_fixture(name, html, base_url, args.repeat) for name, html in fixtures.items()},
+        }
+    finally:
+        server.shutdown()
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as fh:
+            report['p50_ratio_vs_baseline'] = compare(report, json.load(fh))
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as fh:
+            fh.write(output)
+    print(output)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=30)
+    parser.add_argument('--only', nargs='*', help="Yalnızca bu fikstürleri çalıştır (ör. small large)")
+    parser.add_argument('--output', help="JSON çıktısının yazılacağı dosya")
+    parser.add_argument('--compare', help="Karşılaştırılacak önceki JSON çıktısı")
+    main(parser.parse_args())
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""
+Google Forms yerine geçen yerel HTTP sunucusu.
+
+Benchmark ve yük testleri canlı Google'a gitmeden çalışabilsin diye
+'/forms/d/e/<id>/viewform' sayfalarını ve 'forms.gle/<kod>' yönlendirmelerini taklit eder.
+Uygulama UPSTREAM_BASE_URL ortam değişkeniyle bu sunucuya yönlendirilir.
+
+    python benchmarks/standin.py --port 8765 --delay 0.5
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Soru tipi döngüsü: kısa yanıt, paragraf, çoktan seçmeli, onay kutuları, açılır liste,
+# ölçek, tablo, tarih, saat, derecelendirme
+QUESTION_KINDS = (0, 1, 2, 4, 3, 5, 7, 9, 10, 18)
+
+
+def make_form_html(questions: int = 20, sections: int = 1, kinds=QUESTION_KINDS) -> str:
+    """Gerçek form sayfasının yapısını (FB_PUBLIC_LOAD_DATA_ + item kapsayıcıları) taklit eden HTML üretir."""
+    items, containers = [], []
+    item_id, entry_id = 1000, 5000
+    per_section = max(1, questions // max(1, sections))
+    for i in range(questions):
+        if i and sections > 1 and i % per_section == 0:
+            items.append([item_id, f"Bölüm {i // per_section + 1}", "Bölüm açıklaması", 8, None])
+            item_id += 1
+        kind = kinds[i % len(kinds)]
+        if kind in (2, 3, 4):
+            options = [[f"Seçenek {j + 1}"] for j in range(4)]
+            if kind != 3 and i % 2 == 0:
+                options.append(["", None, None, None, 1])  # "Diğer"
+            info = [[entry_id, options, i % 2]]
+        elif kind == 5:
+            info = [[entry_id, [[str(j)] for j in range(1, 6)], 1, ["Hiç", "Çok"]]]
+        elif kind == 18:
+            info = [[entry_id, [[j] for j in range(1, 6)], 0]]
+        elif kind == 7:
+            columns = [["Az"], ["Orta"], ["Çok"]]
+            checkbox = [1] if i % 2 else None
+            info = [[entry_id + r, columns, r % 2, [f"Satır {r + 1}"], None, None, None, None, None, None, None, checkbox]
+                    for r in range(3)]
+            entry_id += 3
+        else:
+            info = [[entry_id, None, i % 3 == 0]]
+        entry_id += 1
+        image = [f"https://lh3.googleusercontent.com/standin-q{i}"] if i % 5 == 0 else None
+        items.append([item_id, f"Soru {i + 1}", f"Soru {i + 1} açıklaması", kind, info, image,
+                      [None, f"<b>Soru {i + 1}</b> metni", None]])
+        option_html = ''
+        if kind in (2, 4):
+            option_html = ''.join(
+                '<div class="docssharedWizToggleLabeledContainer">'
+                + (f'<img class="L05vke" src="https://lh3.googleusercontent.com/standin-o{i}-{j}">' if i % 3 == 0 else '')
+                + f'<span>Seçenek {j + 1}</span></div>'
+                for j in range(4)
+            )
+        containers.append(f'<div jsmodel="CP1oW" data-item-id="{item_id}">{option_html}</div>')
+        item_id += 1
+
+    form_info = ["Yerel Form", items, None, None, None, None, None, None, "Yerel <i>Deneme</i> Formu", None, [1]]
+    payload = json.dumps([None, form_info, "/forms", "Yerel Form"], ensure_ascii=False)
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8"><script nonce="x">var _docs_flag = 1;</script></head><body>'
+        '<div class="cBGGJ">Yerel deneme formu. <a href="https://example.com">Bağlantı</a><ul><li>Madde</li></ul></div>'
+        + ''.join(containers)
+        + f'<script type="text/javascript" nonce="x">var FB_PUBLIC_LOAD_DATA_ = {payload};</script></body></html>'
+    )
+
+
+FORM_PATH_RE = re.compile(r'^/forms/d/e/([A-Za-z0-9_-]+)/viewform')
+SIZE_RE = re.compile(r'q(\d+)')
+SECTION_RE = re.compile(r's(\d+)')
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """
+    '/forms/d/e/<id>/viewform' için sentetik form döndürür. Soru ve bölüm sayısı
+    kimlik içindeki 'q<N>' ve 's<N>' parçalarından okunur (ör. 'bench-q200-s4').
+    '/forms.gle/<kod>' istekleri '/forms/d/e/<kod>/viewform' adresine yönlendirilir.
+    '/forms/d/e/<id>/formResponse' gönderimleri kabul edilip server.submissions listesine eklenir.
+    Form sayfası istekleri de (testlerde indirme sayısını görmek için) server.fetches listesine yazılır.
+    """
+
+    server_version = "FormStandIn/1.0"
+    pages = {}  # Sunucuya önceden yüklenmiş sayfalar: form kimliği -> HTML
+
+    def log_message(self, format, *args):
+        pass
+
+    def _respond(self, head_only: bool):
+        if self.server.delay:
+            time.sleep(self.server.delay)
+        if self.path.startswith('/forms.gle/'):
+            code = self.path[len('/forms.gle/'):].split('?', 1)[0]
+            self.send_response(302)
+            self.send_header('Location', f'/forms/d/e/{code}/viewform')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        match = FORM_PATH_RE.match(self.path)
+        if not match:
+            self.send_error(404)
+            return
+        form_id = match.group(1)
+        self.server.fetches.append(form_id)
+        html = self.pages.get(form_id)
+        if html is None:
+            size = SIZE_RE.search(form_id)
+            sections = SECTION_RE.search(form_id)
+            html = make_form_html(int(size.group(1)) if size else 20, int(sections.group(1)) if sections else 1)
+        body = html.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if not head_only:
+            self.wfile.write(body)
+
+    def do_GET(self):
+        self._respond(head_only=False)
+
+    def do_HEAD(self):
+        self._respond(head_only=True)
+
+    def do_POST(self):
+        if self.server.delay:
+            time.sleep(self.server.delay)
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        if not self.path.split('?', 1)[0].endswith('/formResponse'):
+            self.send_error(404)
+            return
+        self.server.submissions.append((self.path, body.decode('utf-8')))
+        reply = b'<html><body>Yanitiniz kaydedildi.</body></html>'
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(reply)))
+        self.end_headers()
+        self.wfile.write(reply)
+
+
+def start_standin(port: int = 0, delay: float = 0.0, pages=None):
+    """Sunucuyu arka planda başlatır; (sunucu, temel_url) döndürür."""
+    handler = type('Handler', (StandInHandler,), {'pages': dict(pages or {})})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.daemon_threads = True
+    server.delay = delay
+    server.submissions = []
+    server.fetches = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--delay', type=float, default=0.0, help="Her yanıttan önce beklenecek süre (saniye)")
+    args = parser.parse_args()
+    server, base_url = start_standin(args.port, args.delay)
+    print(f"Yerel Google Forms: {base_url}  (UPSTREAM_BASE_URL={base_url})")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Açılış süresi ve worker başına bellek ölçümü.
+
+Her ölçüm taze bir Python sürecinde yapılır:
+- 'import app' süresi ve hemen sonrasındaki tepe RSS,
+- gunicorn ile başlatılan worker'ların giriş sayfasını sunduktan sonraki RSS değerleri (yalnızca Linux).
+
+Varsayılan (tembel yükleme) profil, ağır bağımlılıkların önceden yüklendiği
+'WARM_IMPORTS=1 --preload' profiliyle karşılaştırılır.
+
+    python benchmarks/startup_bench.py --repeat 5 --workers 2
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_PROBE = """
+import json, resource, sys, time
+started = time.perf_counter()
+import app
+elapsed = time.perf_counter() - started
+heavy = [m for m in ('requests', 'bs4', 'openpyxl', 'lxml', 'pandas') if m in sys.modules]
+print(json.dumps({'import_s': elapsed, 'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, 'heavy_modules': heavy}))
+"""
+
+PROFILES = {
+    'lazy': ({}, []),
+    'warm_preload': ({'WARM_IMPORTS': '1'}, ['--preload']),
+}
+
+
+def measure_import(env, repeat):
+    samples = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, '-c', IMPORT_PROBE], cwd=ROOT, env=env,
+                             capture_output=True, text=True, check=True).stdout
+        samples.append(json.loads(out.strip().splitlines()[-1]))
+    return {
+        'import_ms_median': round(statistics.median(s['import_s'] for s in samples) * 1000, 1),
+        'max_rss_mb': round(statistics.median(s['max_rss_kb'] for s in samples) / 1024, 1),
+        'heavy_modules_loaded': samples[-1]['heavy_modules'],
+    }
+
+
+def rss_mb(pid):
+    with open(f'/proc/{pid}/status') as fh:
+        for line in fh:
+            if line.startswith('VmRSS:'):
+                return round(int(line.split()[1]) / 1024, 1)
+    return None
+
+
+def worker_pids(master_pid):
+    with open(f'/proc/{master_pid}/task/{master_pid}/children') as fh:
+        return [int(pid) for pid in fh.read().split()]
+
+
+def measure_workers(env, extra_args, workers, port):
+    if not sys.platform.startswith('linux'):
+        return None
+    cmd = [sys.executable, '-m', 'gunicorn', 'app:create_app()', '--bind', f'127.0.0.1:{port}',
+           '--workers', str(workers), '--worker-class', 'gthread', '--threads', '4', '--log-level', 'warning']
+    started = time.perf_counter()
+    server = subprocess.Popen(cmd + extra_args, cwd=ROOT, env=env)
+    try:
+        url = f'http://127.0.0.1:{port}/'
+        while True:
+            try:
+                requests.get(url, timeout=1)
+                break
+            except requests.RequestException:
+                if time.perf_counter() - started > 30:
+                    raise RuntimeError("gunicorn 30 sn içinde hazır olmadı")
+                time.sleep(0.05)
+        ready_s = time.perf_counter() - started
+        for _ in range(workers * 4):  # her worker'ın en az bir istek sunması için
+            requests.get(url, timeout=5)
+        return {
+            'first_response_s': round(ready_s, 3),
+            'master_rss_mb': rss_mb(server.pid),
+            'worker_rss_mb': [rss_mb(pid) for pid in worker_pids(server.pid)],
+        }
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+def main(args):
+    report = {}
+    for name, (extra_env, extra_args) in PROFILES.items():
+        env = dict(os.environ, STRUCTURE_STORE_BACKEND='memory', **extra_env)
+        report[name] = {
+            'import': measure_import(env, args.repeat),
+            'gunicorn': measure_workers(env, extra_args, args.workers, args.port),
+        }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--port', type=int, default=8798)
+    main(parser.parse_args())
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+submit() cevap eşleme mikro-benchmark'ı.
+
+300 soruluk sentetik bir formda, her soru başlığını istek sırasında BeautifulSoup ile
+düz metne çeviren eski yöntemi, analiz sırasında önceden hesaplanmış etiketleri okuyan
+iter_answer_rows() ile karşılaştırır. Ayrıca /submit uç noktasının tamamını ölçer.
+
+    python benchmarks/submit_bench.py --questions 300 --repeat 30
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+from werkzeug.datastructures import MultiDict
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.dirname(HERE))
+
+os.environ.setdefault('RESPONSE_COLLECTION', '0')
+os.environ.setdefault('STRUCTURE_STORE_BACKEND', 'memory')
+
+import app  # noqa: E402
+from standin import make_form_html  # noqa: E402
+
+
+def legacy_labels(form_structure):
+    """Eski submit() davranışı: her soru için yeni bir BeautifulSoup ağacı ve tip adında metin aramaları."""
+    from bs4 import BeautifulSoup
+
+    labels = []
+    for question in form_structure.questions():
+        q_type = str(question.type)
+        if q_type == 'Başlık':
+            continue
+        text = BeautifulSoup(question.text, "html.parser").get_text(separator=" ", strip=True)
+        text = text or f"İsimsiz Soru ({q_type})"
+        if 'Tablo' in q_type:
+            labels.extend(f"{text} [{row.text}]" for row in question.rows)
+        else:
+            labels.append(text)
+    return labels
+
+
+def sample_answers(form_structure):
+    answers = MultiDict()
+    for question in form_structure.questions():
+        for row in question.rows:
+            answers.add(row.entry_id, question.cols[0])
+        if question.entry_id:
+            answers.add(question.entry_id, 'Yanıt')
+    return answers
+
+
+def timed(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return {'mean_ms': round(statistics.fmean(timings) * 1000, 3),
+            'p95_ms': round(timings[int(0.95 * (len(timings) - 1))] * 1000, 3)}
+
+
+def main(args):
+    form_structure = app.parse_google_form_html(make_form_html(args.questions, 1))['form_data']
+    answers = sample_answers(form_structure)
+
+    report = {
+        'questions': args.questions,
+        'legacy_bs4_labels': timed(lambda: legacy_labels(form_structure), args.repeat),
+        'precomputed_answer_rows': timed(lambda: list(app.iter_answer_rows(form_structure, answers)), args.repeat),
+    }
+
+    client = app.app.test_client()
+
+    def full_submit():
+        data = answers.copy()
+        data['form_token'] = app.save_form_structure(form_structure)
+        resp = client.post('/submit', data=data)
+        assert resp.status_code == 200, resp.status_code
+
+    report['submit_endpoint'] = timed(full_submit, args.repeat)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--questions', type=int, default=300)
+    parser.add_argument('--repeat', type=int, default=30)
+    main(parser.parse_args())
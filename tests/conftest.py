@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+Testler uygulamayı yerel form sunucusuna (benchmarks/standin.py) yönlendirir; veritabanları ve kilit
+dosyaları geçici bir dizinde tutulur. app modülü ayarlarını içe aktarılırken okuduğundan ortam
+değişkenleri import'tan önce ayarlanır.
+
+    python -m pytest -q
+"""
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'benchmarks')]
+
+from standin import start_standin  # noqa: E402
+
+_TMP = tempfile.TemporaryDirectory(prefix='formklon-tests-')
+STANDIN, STANDIN_URL = start_standin()
+os.environ.update({
+    'UPSTREAM_BASE_URL': STANDIN_URL,
+    'BROWSER_FALLBACK': '0',
+    'FORWARD_WORKERS': '0',  # iletim işlerini testler claim()/deliver() ile kendisi işler
+    'FORM_CACHE_PATH': os.path.join(_TMP.name, 'cache.sqlite3'),
+    'IMAGE_CACHE_PATH': os.path.join(_TMP.name, 'images.sqlite3'),
+    'PROFILE_DIR': os.path.join(_TMP.name, 'profiles'),
+    'COALESCE_LOCK_DIR': os.path.join(_TMP.name, 'locks'),
+    'FORM_HISTORY_DB_PATH': os.path.join(_TMP.name, 'form_history.sqlite3'),
+    'RESPONSES_DB_PATH': os.path.join(_TMP.name, 'responses.sqlite3'),
+    'FORWARD_DB_PATH': os.path.join(_TMP.name, 'forward.sqlite3'),
+})
+
+import app  # noqa: E402
+
+
+@pytest.fixture
+def standin():
+    """Paylaşılan yerel form sunucusu; kayıtları her testte boştur, gecikme ve sayfalar test sonunda sıfırlanır."""
+    STANDIN.fetches.clear()
+    STANDIN.submissions.clear()
+    yield STANDIN
+    STANDIN.delay = 0.0
+    STANDIN.RequestHandlerClass.pages.clear()
+
+
+@pytest.fixture
+def counter():
+    """Sayaç değerini okur: counter('formklon_forward_total', ('result', 'ok'))."""
+    def value(name: str, *labels):
+        return app.metrics._counters.get((name, labels), 0)
+    return value
+
+
+def form_url(form_id: str) -> str:
+    return f"https://docs.google.com/forms/d/e/{form_id}/viewform"
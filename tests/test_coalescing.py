@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""Aynı formun eşzamanlı analizlerinin tek indirmede birleştirilmesi (SingleFlight)."""
+
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import app
+from conftest import ROOT, form_url
+
+WORKER_SCRIPT = """
+import sys, time
+sys.path.insert(0, {root!r})
+import app
+time.sleep(max(0, {start!r} - time.time()))
+print('form_data' in app.analyze_google_form({url!r}))
+"""
+
+
+def analyze_concurrently(url: str, callers: int):
+    with ThreadPoolExecutor(callers) as pool:
+        return list(pool.map(lambda _: app.analyze_google_form(url), range(callers)))
+
+
+def test_threads_share_one_fetch(standin, tmp_path, monkeypatch):
+    standin.delay = 0.3
+    lock_dir = tmp_path / 'locks'
+    monkeypatch.setattr(app, 'form_flights', app.SingleFlight(10, str(lock_dir)))
+
+    results = analyze_concurrently(form_url('co-threads-q12'), 20)
+
+    assert all('form_data' in result for result in results)
+    assert standin.fetches == ['co-threads-q12']
+    assert os.listdir(lock_dir) == []
+
+
+def test_workers_share_one_fetch(standin, tmp_path):
+    standin.delay = 1.0
+    env = dict(os.environ, FORM_CACHE_BACKEND='sqlite', FORM_CACHE_PATH=str(tmp_path / 'cache.sqlite3'),
+               COALESCE_LOCK_DIR=str(tmp_path / 'locks'))
+    script = WORKER_SCRIPT.format(root=ROOT, start=time.time() + 2, url=form_url('co-workers-q12'))
+    workers = [subprocess.Popen([sys.executable, '-c', script], env=env, stdout=subprocess.PIPE, text=True)
+               for _ in range(3)]
+    outputs = [worker.communicate(timeout=60)[0].split() for worker in workers]
+
+    assert outputs == [['True']] * 3
+    assert standin.fetches == ['co-workers-q12']
+    assert os.listdir(tmp_path / 'locks') == []
+
+
+def test_timeout_returns_busy_without_fetching(standin, monkeypatch, counter):
+    standin.delay = 1.5
+    monkeypatch.setattr(app, 'form_flights', app.SingleFlight(0.3))
+    timeouts = counter('formklon_coalesced_total', ('role', 'timeout'))
+
+    results = analyze_concurrently(form_url('co-timeout-q12'), 5)
+
+    assert standin.fetches == ['co-timeout-q12']
+    assert sum('form_data' in result for result in results) == 1
+    assert sum('analiz ediliyor' in result.get('error', '') for result in results) == 4
+    assert counter('formklon_coalesced_total', ('role', 'timeout')) - timeouts == 4
+
+
+def test_timeout_serves_stale_entry(standin, monkeypatch, counter):
+    url = form_url('co-stale-q12')
+    assert 'form_data' in app.analyze_google_form(url)
+    monkeypatch.setattr(app.form_cache, 'ttl', 0)
+    standin.delay = 1.5
+    monkeypatch.setattr(app, 'form_flights', app.SingleFlight(0.3))
+    stale = counter('formklon_cache_total', ('cache', 'form'), ('result', 'stale'))
+
+    results = analyze_concurrently(url, 3)
+
+    assert all('form_data' in result for result in results)
+    assert standin.fetches == ['co-stale-q12', 'co-stale-q12']
+    assert counter('formklon_cache_total', ('cache', 'form'), ('result', 'stale')) - stale == 2
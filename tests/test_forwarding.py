@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""Gönderilen yanıtların kalıcı kuyruk üzerinden asıl Google Formu'na iletilmesi (ForwardQueue)."""
+
+import re
+import sqlite3
+
+import pytest
+
+import app
+from conftest import form_url
+
+
+@pytest.fixture
+def forward_queue(tmp_path, monkeypatch):
+    queue = app.ForwardQueue(str(tmp_path / 'forward.sqlite3'), workers=0, rate_per_form=0, max_attempts=3)
+    monkeypatch.setattr(app, 'forward_queue', queue)
+    return queue
+
+
+@pytest.fixture
+def response_store(tmp_path, monkeypatch):
+    store = app.ResponseStore(str(tmp_path / 'responses.sqlite3'))
+    monkeypatch.setattr(app, 'response_store', store)
+    return store
+
+
+def open_form(client, form_id: str) -> str:
+    """Formu klonlar ve sayfaya yazılan yapı anahtarını döndürür."""
+    resp = client.post('/', data={'url': form_url(form_id)})
+    assert resp.status_code == 200
+    return re.search(r'name="form_token" value="([^"]+)"', resp.get_data(as_text=True)).group(1)
+
+
+def archived(store, form_id: str) -> int:
+    return len(list(store.iter_rows(form_id, store.columns(form_id))))
+
+
+def test_same_token_is_forwarded_once(standin, forward_queue, response_store, counter):
+    client = app.app.test_client()
+    token = open_form(client, 'fwd-dup-q6')
+    stored = app.structure_store.get(token)
+    duplicates = counter('formklon_forward_total', ('result', 'duplicate'))
+
+    assert client.post('/submit', data={'form_token': token, 'entry.5000': 'bir'}).status_code == 200
+    app.structure_store.set(token, stored)  # başka bir worker'da kalmış eski kopya
+    resp = client.post('/submit', data={'form_token': token, 'entry.5000': 'bir'})
+    assert resp.status_code == 200 and resp.mimetype == app.XLSX_MIMETYPE
+    other = open_form(client, 'fwd-dup-q6')
+    assert client.post('/submit', data={'form_token': other, 'entry.5000': 'iki'}).status_code == 200
+
+    assert forward_queue.counts() == (2, 0)
+    assert archived(response_store, 'fwd-dup-q6') == 2
+    assert counter('formklon_forward_total', ('result', 'duplicate')) - duplicates == 1
+
+
+def test_job_is_posted_to_form_response(standin, forward_queue, response_store):
+    client = app.app.test_client()
+    token = open_form(client, 'fwd-post-q6')
+    client.post('/submit', data={'form_token': token, 'entry.5000': 'merhaba'})
+
+    job, _ = forward_queue.claim()
+    forward_queue.deliver(job)
+
+    assert [path for path, _ in standin.submissions] == ['/forms/d/e/fwd-post-q6/formResponse']
+    assert 'entry.5000=merhaba' in standin.submissions[0][1]
+    assert forward_queue.counts() == (0, 0)
+
+
+def test_bookkeeping_error_does_not_repost(standin, forward_queue, monkeypatch):
+    forward_queue.enqueue('fwd-book', form_url('fwd-book').replace('viewform', 'formResponse'), 'entry.5000=x')
+    record, calls = forward_queue._record, []
+
+    def flaky(*args):
+        calls.append(args)
+        if len(calls) < 3:
+            raise sqlite3.OperationalError('database is locked')
+        return record(*args)
+
+    monkeypatch.setattr(forward_queue, '_record', flaky)
+    job, _ = forward_queue.claim()
+    forward_queue.deliver(job)
+
+    assert len(standin.submissions) == 1
+    assert len(calls) == 3
+    assert forward_queue.counts() == (0, 0)
+
+
+def test_unexpected_error_counts_as_attempt(standin, forward_queue, monkeypatch):
+    def broken(*args, **kwargs):
+        raise ValueError('bug')
+
+    monkeypatch.setattr(app, 'upstream_request', broken)
+    forward_queue.enqueue('fwd-bug', form_url('fwd-bug').replace('viewform', 'formResponse'), 'entry.5000=x')
+    conn = forward_queue._conn()
+    for attempt in range(1, forward_queue.max_attempts):
+        job, _ = forward_queue.claim()
+        forward_queue.deliver(job)
+        assert conn.execute("SELECT attempts, last_error FROM forward_jobs").fetchone() == (attempt, 'ValueError: bug')
+        conn.execute("UPDATE forward_jobs SET next_attempt_at = 0")
+
+    job, _ = forward_queue.claim()
+    forward_queue.deliver(job)
+
+    assert forward_queue.counts() == (0, 1)
+
+
+def test_enqueue_error_does_not_fail_submit(standin, forward_queue, response_store, monkeypatch, counter):
+    def broken(*args, **kwargs):
+        raise sqlite3.OperationalError('disk I/O error')
+
+    client = app.app.test_client()
+    token = open_form(client, 'fwd-broken-q6')
+    monkeypatch.setattr(forward_queue, 'enqueue', broken)
+    errors = counter('formklon_store_errors_total', ('store', 'forward'))
+
+    resp = client.post('/submit', data={'form_token': token, 'entry.5000': 'merhaba'})
+
+    assert resp.status_code == 200 and resp.mimetype == app.XLSX_MIMETYPE
+    assert archived(response_store, 'fwd-broken-q6') == 1
+    assert counter('formklon_store_errors_total', ('store', 'forward')) - errors == 1
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""Sayfa özetiyle yeniden ayrıştırmayı atlama ve form yapı geçmişi (FormHistory)."""
+
+import sqlite3
+
+import pytest
+
+import app
+from conftest import form_url
+from standin import make_form_html
+
+
+@pytest.fixture
+def form_history(tmp_path, monkeypatch):
+    history = app.FormHistory(str(tmp_path / 'form_history.sqlite3'), max_versions=20)
+    monkeypatch.setattr(app, 'form_history', history)
+    return history
+
+
+def analyze_uncached(form_id: str):
+    """Önbelleği atlayarak formu yeniden indirir ve analiz eder."""
+    url = form_url(form_id)
+    app.form_cache.store.delete(app.canonical_form_url(url))
+    return app.analyze_google_form(url)
+
+
+def test_reverts_are_kept_as_versions(standin, form_history, monkeypatch):
+    parse, parses = app.parse_google_form_html, []
+    monkeypatch.setattr(app, 'parse_google_form_html', lambda html: parses.append(html) or parse(html))
+    a, b = make_form_html(8), make_form_html(10)
+
+    for html in (a, a, b, a, b):
+        standin.RequestHandlerClass.pages['hist-revert'] = html
+        assert 'form_data' in analyze_uncached('hist-revert')
+
+    assert len(parses) == 2
+    fingerprints = [version[0] for version in form_history.versions('hist-revert')]
+    assert len(fingerprints) == 4
+    assert fingerprints[0] == fingerprints[2] != fingerprints[1] == fingerprints[3]
+
+
+def test_known_fingerprint_reuses_structure(standin, form_history):
+    first = analyze_uncached('hist-known-q12')['form_data']
+    again = analyze_uncached('hist-known-q12')['form_data']
+
+    assert app.encode_form(again) == app.encode_form(first)
+    assert len(form_history.versions('hist-known-q12')) == 1
+
+
+def test_history_errors_do_not_fail_analysis(standin, form_history, monkeypatch, counter):
+    def broken(*args):
+        raise sqlite3.OperationalError('database is locked')
+
+    monkeypatch.setattr(form_history, 'lookup', broken)
+    monkeypatch.setattr(form_history, 'record', broken)
+    errors = counter('formklon_store_errors_total', ('store', 'history'))
+
+    result = analyze_uncached('hist-broken-q12')
+
+    assert 'form_data' in result and result['form_data'].form_id == 'hist-broken-q12'
+    assert counter('formklon_store_errors_total', ('store', 'history')) - errors == 2